@@ -2,6 +2,7 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import os
+from lca_core import REQUIRED_COLUMNS, load_products
 
 # Define paths
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -19,22 +20,14 @@ if not os.path.exists(LOGO_FILE):
 
 # Load data
 try:
-    data = pd.read_csv(DATA_FILE)
+    # Validated against the product schema and cached by lca_core
+    catalog = load_products(DATA_FILE)
+    data = catalog.products
     st.write("### Loaded Data")
     st.write(data.head())  # Display the first few rows to ensure data is loaded correctly
-
-    # Ensure columns are as expected
-    expected_columns = [
-        "Product Name",
-        "Raw Material (kg CO2)",
-        "Production (kg CO2)",
-        "Logistics (kg CO2)",
-        "Total Carbon Footprint (kg CO2)"
-    ]
-    if not all(column in data.columns for column in expected_columns):
-        st.error(f"The dataset does not contain the expected columns: {expected_columns}")
-        st.write("Found columns:", list(data.columns))
-        st.stop()
+except ValueError as e:
+    st.error(f"The dataset does not contain the expected columns {REQUIRED_COLUMNS}: {e}")
+    st.stop()
 except Exception as e:
     st.error(f"Error loading data: {e}")
     st.stop()
@@ -76,7 +69,7 @@ elif selected_tab == "Financial Analysis":
 
     # Example static calculation
     carbon_price = 25  # €/ton, example price
-    total_emissions = data["Total Carbon Footprint (kg CO2)"].sum() / 1000  # Convert to tons
+    total_emissions = catalog.total_tons()
     total_cost = total_emissions * carbon_price
 
     st.write(f"### Total Emissions: {total_emissions:.2f} tons")
@@ -2,6 +2,7 @@ import os
 import pandas as pd
 import streamlit as st
 import plotly.express as px
+from lca_core import load_products
 
 # Automatically change the working directory to the script's directory
 os.chdir(os.path.dirname(__file__))
@@ -9,17 +10,17 @@ os.chdir(os.path.dirname(__file__))
 # Set page configuration
 st.set_page_config(page_title="CLEAR Dashboard", layout="wide")
 
-# Load dataset
-@st.cache_data
-def load_data(file_path):
-    try:
-        return pd.read_csv(file_path)
-    except FileNotFoundError:
-        st.error(f"File not found: {file_path}")
-        return pd.DataFrame()
-
+# Load dataset; the catalog and everything derived from it is cached by lca_core
 data_file = "sano_lca_products.csv"
-data = load_data(data_file)
+try:
+    catalog = load_products(data_file)
+    data = catalog.products
+except FileNotFoundError:
+    st.error(f"File not found: {data_file}")
+    data = pd.DataFrame()
+except ValueError as e:
+    st.error(f"Invalid dataset: {e}")
+    data = pd.DataFrame()
 
 if data.empty:
     st.error("Dataset could not be loaded. Please ensure the CSV file is available.")
@@ -50,23 +51,7 @@ if selected_tab == "Environmental Analysis":
     export_ratio = st.sidebar.slider("Percent of Products Exported to EU", 0, 100, 20, key="export")
 
     # Adjust emissions based on scenario inputs
-    adjusted_data = data.copy()
-    if transport_type == "Air":
-        adjusted_data["Logistics (kg CO2)"] *= 1.5
-    elif transport_type == "Sea":
-        adjusted_data["Logistics (kg CO2)"] *= 0.8
-
-    if energy_source == "Renewable":
-        adjusted_data["Production (kg CO2)"] *= 0.7
-    else:
-        adjusted_data["Production (kg CO2)"] *= 1.2
-
-    # Update Total Carbon Footprint
-    adjusted_data["Total Carbon Footprint (kg CO2)"] = (
-        adjusted_data["Raw Material (kg CO2)"] +
-        adjusted_data["Production (kg CO2)"] +
-        adjusted_data["Logistics (kg CO2)"]
-    )
+    adjusted_data = catalog.adjusted(transport_type, energy_source)
 
     # Display Adjusted Metrics
     st.subheader("Adjusted Emissions Data")
@@ -104,24 +89,24 @@ elif selected_tab == "Financial Analysis":
     carbon_tax_rate = st.slider("Set Carbon Tax Rate (€/ton)", min_value=10, max_value=100, value=25, step=5)
 
     # Calculate Total Carbon Emissions (tons)
-    data["Total Carbon Footprint (tons)"] = data["Total Carbon Footprint (kg CO2)"] / 1000
-    data["Carbon Tax (€)"] = data["Total Carbon Footprint (tons)"] * carbon_tax_rate
+    tax_model = catalog.tax_model()
+    cost_breakdown = tax_model.frame(carbon_tax_rate)
 
     # Display Metrics
-    total_emissions = data["Total Carbon Footprint (tons)"].sum()
-    total_tax_cost = data["Carbon Tax (€)"].sum()
+    total_emissions = tax_model.total_tons
+    total_tax_cost = tax_model.total_tax(carbon_tax_rate)
 
     st.metric(label="Total Carbon Emissions (tons)", value=f"{total_emissions:.2f}")
     st.metric(label="Total Carbon Tax Cost (€)", value=f"€{total_tax_cost:.2f}")
 
     # Cost Breakdown Table
     st.subheader("Cost Breakdown by Product")
-    st.dataframe(data[["Product Name", "Total Carbon Footprint (tons)", "Carbon Tax (€)"]])
+    st.dataframe(cost_breakdown)
 
     # Bar Chart for Cost Distribution
     st.subheader("Cost Distribution by Product")
     bar_chart = px.bar(
-        data,
+        cost_breakdown,
         x="Product Name",
         y="Carbon Tax (€)",
         title="Carbon Tax Costs by Product",
@@ -1,6 +1,8 @@
 import pandas as pd
 import streamlit as st
 import plotly.express as px
+from lca_core import catalog_for, total_tons
+from cbam_liability import export_shipments, liability_for, price_schedule_for
 
 # Hardcoded dataset (from CSV)
 data_dict = [
@@ -12,7 +14,8 @@ data_dict = [
 ]
 
 # Convert dictionary to pandas DataFrame
-data = pd.DataFrame(data_dict)
+catalog = catalog_for(pd.DataFrame(data_dict), version="app_sano1-demo")
+data = catalog.products
 
 # Dashboard Configuration
 st.set_page_config(page_title="Sano LCA Dashboard", layout="wide")
@@ -29,7 +32,7 @@ st.sidebar.header("Navigation")
 selected_tab = st.sidebar.radio("Select a tab:", ["Environmental Analysis", "Financial Analysis", "Regulatory Compliance"])
 
 # Define filtered data globally
-filtered_data = data.copy()
+filtered_data = data
 
 # Environmental Analysis Tab
 if selected_tab == "Environmental Analysis":
@@ -39,22 +42,14 @@ if selected_tab == "Environmental Analysis":
     export_ratio = st.sidebar.slider("Percent of Products Exported to EU", 0, 100, 20, key="export")
 
     # Filter data based on sidebar inputs
-    if transport_type == "Air":
-        filtered_data["Logistics (kg CO2)"] *= 1.5
-    elif transport_type == "Sea":
-        filtered_data["Logistics (kg CO2)"] *= 0.8
-
-    if energy_source == "Renewable":
-        filtered_data["Production (kg CO2)"] *= 0.7
-    else:
-        filtered_data["Production (kg CO2)"] *= 1.2
-
-    # Update Total Carbon Footprint
-    filtered_data["Total Carbon Footprint (kg CO2)"] = (
-        filtered_data["Raw Material (kg CO2)"] +
-        filtered_data["Production (kg CO2)"] +
-        filtered_data["Logistics (kg CO2)"]
+    filtered_data = catalog.adjusted(transport_type, energy_source)
+
+    # CBAM liability of the exported share at this year's ETS price and phase-in
+    cbam_liability = liability_for(
+        export_shipments(filtered_data, export_ratio), filtered_data, price_schedule_for(),
+        (catalog.version, transport_type, energy_source, export_ratio)
     )
+    st.sidebar.metric("Estimated CBAM Liability (€)", f"€{cbam_liability.cost:,.2f}")
 
     # Main Layout
     st.header("Product List and Carbon Footprints")
@@ -118,7 +113,7 @@ elif selected_tab == "Financial Analysis":
     st.metric(label="Current Carbon Credit Price (€/ton)", value=f"€{carbon_price}")
 
     # Financial Projections
-    carbon_emissions = filtered_data["Total Carbon Footprint (kg CO2)"].sum() / 1000  # Convert to tons
+    carbon_emissions = total_tons(filtered_data)
     total_cost = carbon_emissions * carbon_price
     st.write(f"### Total Carbon Emissions: {carbon_emissions:.2f} tons")
     st.write(f"### Estimated Carbon Costs: €{total_cost:.2f}")
@@ -1,12 +1,18 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import requests
 import plotly.express as px
+from lca_core import compliance_status, load_products, total_tons
+from cbam_liability import export_shipments, liability_for, price_schedule_for
+from chart_data import top_n_with_other
+from dashboard_components import paged_table
 
 
 # Load default product data
 default_data_path = 'sano_lca_products.csv'  # Ensure the file is in the correct directory
-data = pd.read_csv(default_data_path)
+catalog = load_products(default_data_path)
+data = catalog.products
 
 # Dashboard Configuration
 st.set_page_config(page_title="Sano LCA Dashboard", layout="wide")
@@ -24,7 +30,7 @@ st.sidebar.header("Navigation")
 selected_tab = st.sidebar.radio("Select a tab:", ["Environmental Analysis", "Financial Analysis", "Regulatory Compliance"])
 
 # Define filtered_data globally
-filtered_data = data.copy()
+filtered_data = data
 
 if selected_tab == "Environmental Analysis":
     # Sidebar for Parameters
@@ -33,23 +39,16 @@ if selected_tab == "Environmental Analysis":
     energy_source = st.sidebar.selectbox("Energy Source", ["Renewable", "Non-renewable"], key="energy")
     export_ratio = st.sidebar.slider("Percent of Products Exported to EU", 0, 100, 20, key="export")
 
-    # Filter Data Based on Sidebar Inputs
-    if transport_type == "Air":
-        filtered_data["Logistics (kg CO2)"] *= 1.5
-    elif transport_type == "Sea":
-        filtered_data["Logistics (kg CO2)"] *= 0.8
+    # Filter Data Based on Sidebar Inputs; each scenario and its sorted index are built once
+    filtered_data = catalog.adjusted(transport_type, energy_source)
+    footprint_index = catalog.footprint_index(transport_type, energy_source)
 
-    if energy_source == "Renewable":
-        filtered_data["Production (kg CO2)"] *= 0.7
-    else:
-        filtered_data["Production (kg CO2)"] *= 1.2
-
-    # Update Total Carbon Footprint
-    filtered_data["Total Carbon Footprint (kg CO2)"] = (
-        filtered_data["Raw Material (kg CO2)"] +
-        filtered_data["Production (kg CO2)"] +
-        filtered_data["Logistics (kg CO2)"]
+    # CBAM liability of the exported share at this year's ETS price and phase-in
+    cbam_liability = liability_for(
+        export_shipments(filtered_data, export_ratio), filtered_data, price_schedule_for(),
+        (catalog.version, transport_type, energy_source, export_ratio)
     )
+    st.sidebar.metric("Estimated CBAM Liability (€)", f"€{cbam_liability.cost:,.2f}")
 
     # Main Layout
     st.header("Product List and Carbon Footprints")
@@ -58,13 +57,13 @@ if selected_tab == "Environmental Analysis":
     # Product Table
     with col1:
         st.subheader("Product List")
-        st.dataframe(filtered_data, height=400)
+        paged_table(filtered_data, key="product_table", height=400, index=footprint_index)
 
     # Emissions Breakdown Pie Chart
     with col2:
         st.subheader("Emissions Breakdown for All Products")
         pie_chart = px.pie(
-            filtered_data,
+            top_n_with_other(filtered_data, "Product Name", "Total Carbon Footprint (kg CO2)"),
             values="Total Carbon Footprint (kg CO2)",
             names="Product Name",
             title="Total Emissions by Product",
@@ -96,15 +95,13 @@ if selected_tab == "Environmental Analysis":
     st.sidebar.header("Additional Filters")
     min_footprint, max_footprint = st.sidebar.slider(
         "Filter by Total Carbon Footprint (kg CO2)",
-        int(filtered_data["Total Carbon Footprint (kg CO2)"].min()),
-        int(filtered_data["Total Carbon Footprint (kg CO2)"].max()),
-        (int(filtered_data["Total Carbon Footprint (kg CO2)"].min()), int(filtered_data["Total Carbon Footprint (kg CO2)"].max()))
+        int(footprint_index.min),
+        int(footprint_index.max),
+        (int(footprint_index.min), int(footprint_index.max))
     )
 
-    filtered_data = filtered_data[
-        (filtered_data["Total Carbon Footprint (kg CO2)"] >= min_footprint) &
-        (filtered_data["Total Carbon Footprint (kg CO2)"] <= max_footprint)
-    ]
+    # Binary search on the sorted index; rows keep their catalog order
+    filtered_data = filtered_data.iloc[np.sort(footprint_index.range_positions(min_footprint, max_footprint))]
 
 elif selected_tab == "Financial Analysis":
     st.header("Financial Analysis")
@@ -121,12 +118,7 @@ elif selected_tab == "Financial Analysis":
 
     # Financial Projections Example
     st.subheader("Cost Projections")
-    filtered_data["Total Carbon Footprint (kg CO2)"] = (
-        filtered_data["Raw Material (kg CO2)"] +
-        filtered_data["Production (kg CO2)"] +
-        filtered_data["Logistics (kg CO2)"]
-    )
-    carbon_emissions = filtered_data["Total Carbon Footprint (kg CO2)"].sum() / 1000  # Convert to tons
+    carbon_emissions = total_tons(filtered_data)
     total_cost = carbon_emissions * carbon_price
     st.write(f"### Total Carbon Emissions: {carbon_emissions:.2f} tons")
     st.write(f"### Estimated Carbon Costs: €{total_cost:.2f}")
@@ -140,7 +132,7 @@ elif selected_tab == "Financial Analysis":
 
     # Visualize Cost Distribution
     cost_chart = px.bar(
-        filtered_data,
+        top_n_with_other(filtered_data, "Product Name", "Total Carbon Footprint (kg CO2)"),
         x="Product Name",
         y="Total Carbon Footprint (kg CO2)",
         title="Cost Distribution by Product",
@@ -167,18 +159,18 @@ elif selected_tab == "Regulatory Compliance":
 
         # Compliance Analysis
         st.subheader("Compliance Analysis")
-        def check_compliance(row, compliance_data):
-            threshold = compliance_data["Threshold"].iloc[0]
-            return "Compliant" if row["Total Carbon Footprint (kg CO2)"] <= threshold else "Non-Compliant"
-
-        filtered_data["Compliance Status"] = filtered_data.apply(
-            lambda row: check_compliance(row, compliance_data), axis=1
-        )
+        try:
+            compliance_results = compliance_status(filtered_data, compliance_data)
+        except ValueError as e:
+            st.error(f"Invalid compliance rules: {e}")
+            st.stop()
+        filtered_data = filtered_data.join(compliance_results)
 
         st.write("### Compliance Results")
-        st.dataframe(filtered_data[["Product Name", "Total Carbon Footprint (kg CO2)", "Compliance Status"]])
+        st.dataframe(filtered_data[["Product Name", "Total Carbon Footprint (kg CO2)", *compliance_results.columns]])
 
         compliance_summary = filtered_data["Compliance Status"].value_counts()
+        compliance_summary = compliance_summary[compliance_summary > 0]
         compliance_chart = px.pie(
             compliance_summary,
             values=compliance_summary.values,
@@ -0,0 +1,146 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+import summary_views
+
+AUDIT_DB = "audit_data.db"
+AUDIT_COLUMNS = ["id", "client_id", "emissions", "compliance_doc", "status", "timestamp"]
+_EMISSIONS_SQL = "{row}.emissions"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    client_id TEXT NOT NULL,
+    emissions REAL NOT NULL,
+    compliance_doc TEXT,
+    status TEXT NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS submissions_status ON submissions (status);
+CREATE TABLE IF NOT EXISTS imports (
+    source TEXT PRIMARY KEY,
+    imported_at TEXT NOT NULL
+);
+""" + summary_views.summary_schema(_EMISSIONS_SQL, ["emissions"])
+
+
+class AuditStore:
+    """SQLite-backed audit submissions shared by every dashboard session.
+
+    The database runs in WAL mode so readers never block the writer, and each
+    submit or approval is a single-row transaction. Counts by status, client and
+    day and the emissions total are kept in trigger-maintained summary tables.
+    """
+
+    def __init__(self, path=AUDIT_DB):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+        summary_views.ensure_summary(self._connect(), _EMISSIONS_SQL)
+
+    def _connect(self):
+        # One connection per thread; Streamlit serves each session from its own thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def submit(self, client_id, emissions, compliance_doc, status="Pending", timestamp=None):
+        """Append a submission and return its ID."""
+        timestamp = timestamp or datetime.now().isoformat()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO submissions (client_id, emissions, compliance_doc, status, timestamp) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (client_id, emissions, compliance_doc, status, timestamp),
+            )
+        return cursor.lastrowid
+
+    def set_status(self, submission_id, status):
+        """Update one submission by ID; return False if it does not exist."""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE submissions SET status = ? WHERE id = ?", (status, submission_id)
+            )
+        return cursor.rowcount == 1
+
+    def approve(self, submission_id):
+        return self.set_status(submission_id, "Approved")
+
+    def count(self, status=None):
+        """Submissions overall or in one status, read from the summary tables."""
+        conn = self._connect()
+        if status is None:
+            row = conn.execute("SELECT COALESCE(SUM(count), 0) FROM status_counts").fetchone()
+        else:
+            row = conn.execute("SELECT COALESCE(SUM(count), 0) FROM status_counts WHERE status = ?", (status,)).fetchone()
+        return row[0]
+
+    def summary(self):
+        """Counts by status, client and day and emissions totals, from the summary tables."""
+        return summary_views.read_summary(self._connect())
+
+    def scan_summary(self):
+        """The same summary recomputed from every submission row."""
+        return summary_views.scan_summary(self._connect(), _EMISSIONS_SQL)
+
+    def rebuild_summary(self):
+        return summary_views.rebuild_summary(self._connect(), _EMISSIONS_SQL)
+
+    def verify_summary(self):
+        """Views that drifted from the rows, as {key: {"expected", "actual"}}; empty when consistent."""
+        return summary_views.diff_summaries(self.scan_summary(), self.summary())
+
+    def page(self, offset=0, limit=50, status=None):
+        """Return one page of submissions as dicts, oldest first."""
+        conn = self._connect()
+        if status is None:
+            rows = conn.execute(
+                "SELECT * FROM submissions ORDER BY id LIMIT ? OFFSET ?", (limit, offset)
+            )
+        else:
+            rows = conn.execute(
+                "SELECT * FROM submissions WHERE status = ? ORDER BY id LIMIT ? OFFSET ?",
+                (status, limit, offset),
+            )
+        return [dict(row) for row in rows]
+
+    def import_json(self, json_path):
+        """Import a legacy audit_data.json list once; return the number of rows added."""
+        source = os.path.abspath(json_path)
+        if not os.path.exists(source):
+            return 0
+        with open(source, "r") as f:
+            entries = json.load(f)
+
+        with self._connect() as conn:
+            # The import marker and the rows commit together, so a retry never duplicates
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO imports (source, imported_at) VALUES (?, ?)",
+                (source, datetime.now().isoformat()),
+            )
+            if cursor.rowcount == 0:
+                return 0
+            conn.executemany(
+                "INSERT INTO submissions (client_id, emissions, compliance_doc, status, timestamp) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        entry.get("client_id", ""),
+                        float(entry.get("emissions", 0.0)),
+                        entry.get("compliance_doc"),
+                        entry.get("status", "Pending"),
+                        entry.get("timestamp") or datetime.now().isoformat(),
+                    )
+                    for entry in entries
+                ],
+            )
+        return len(entries)
@@ -1,49 +1,47 @@
 import os
-import time
 import subprocess
 
+from file_watcher import FileWatcher
+from git_sync import PushQueue, commit_batch
+
 # Path to your local Git repository
-repo_path = "/Users/aviluvchik/Python Projects/Sano"
+repo_path = os.environ.get("AUTO_PUSH_REPO", "/Users/aviluvchik/Python Projects/Sano")
 
 # Branch to push changes to
 branch_name = "main"
 
+# Seconds without writes before a batch of changes is committed
+quiet_window = 2.0
+
 def watch_files():
     """Watch for file changes and auto-commit/push to GitHub."""
     print("Watching for file changes in:", repo_path)
-    last_modified_time = {}
-
-    while True:
-        # Walk through all files in the repository
-        for root, dirs, files in os.walk(repo_path):
-            for file in files:
-                if file.endswith(".py"):  # Only monitor Python files
-                    file_path = os.path.join(root, file)
-                    modified_time = os.path.getmtime(file_path)
-
-                    # If file is new or modified, commit and push
-                    if file_path not in last_modified_time or last_modified_time[file_path] != modified_time:
-                        last_modified_time[file_path] = modified_time
-                        print(f"Detected change in {file_path}. Committing...")
-                        commit_and_push(file_path)
-
-        time.sleep(5)  # Check for changes every 5 seconds
-
-def commit_and_push(file_path):
-    """Commit and push changes to GitHub."""
+    watcher = FileWatcher(repo_path, debounce=quiet_window)
+    print("Using filesystem events." if watcher.use_events else "watchdog not installed; polling for changes.")
+    push_queue = PushQueue(repo_path, branch=branch_name)
+
     try:
-        # Stage the file
-        subprocess.run(["git", "add", file_path], check=True)
-        # Commit with a message
-        subprocess.run(["git", "commit", "-m", f"Auto-commit for {file_path}"], check=True)
-        # Push to the specified branch
-        subprocess.run(["git", "push", "origin", branch_name], check=True)
-        print(f"Committed and pushed changes for {file_path}.")
+        # Each batch is one burst of writes, reported once the files have been quiet for quiet_window
+        for changed in watcher.changes():
+            print(f"Detected changes in {len(changed)} file(s). Committing...")
+            if commit_and_push(changed, push_queue):
+                watcher.mark_handled(changed)
+    finally:
+        push_queue.stop(timeout=30)
+
+def commit_and_push(file_paths, push_queue):
+    """Commit a batch of changed files together and queue a push to GitHub."""
+    try:
+        if commit_batch(repo_path, file_paths):
+            print(f"Committed {len(file_paths)} file(s): {', '.join(file_paths)}")
+            # Pushing happens in the background, so detection carries on meanwhile
+            push_queue.request()
+        return True
     except subprocess.CalledProcessError as e:
-        print(f"Error committing or pushing changes: {e}")
+        print(f"Error committing changes: {e.stderr.strip() or e}")
+        return False
 
 if __name__ == "__main__":
     # Ensure we're in the correct directory
     os.chdir(repo_path)
     watch_files()
-
@@ -0,0 +1,181 @@
+"""Benchmark the dashboard computation paths and the CBAM audit API on synthetic catalogs.
+
+Times CSV loading, scenario adjustment, tax, compliance, chart-data preparation,
+CBAM liability and the cbam_audit.py endpoints (through Flask's test client) for
+each catalog size, and writes the medians as JSON for tracking regressions.
+
+    python benchmarks/bench_dashboard.py --sizes 10,1000,100000,1000000 --output bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["CBAM_STORE"] = "memory"  # The API benchmark must never touch the real database
+
+import lca_core  # noqa: E402
+from catalog_store import load_catalog  # noqa: E402
+from cbam_liability import PRICES_FILE, compute_liability, export_shipments, load_price_schedule  # noqa: E402
+from chart_data import footprint_histogram, stage_totals, top_n_with_other  # noqa: E402
+from compliance_engine import compile_rules  # noqa: E402
+from financials import build_tax_model  # noqa: E402
+from footprint_index import build_footprint_index  # noqa: E402
+from lca_schema import NAME_COLUMN, STAGE_COLUMNS, TOTAL_COLUMN  # noqa: E402
+from scenario_engine import evaluate_scenarios  # noqa: E402
+from synthetic_catalog import CATEGORIES, write_catalog_csv  # noqa: E402
+
+DEFAULT_SIZES = [10, 1_000, 100_000, 1_000_000]
+# API payloads are capped; endpoint cost does not depend on the catalog size beyond this
+DEFAULT_API_MAX = 10_000
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _time(fn, repeat):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+    return runs
+
+
+def _legacy_adjust(data):
+    # The inline copy-and-mutate path the dashboards used before lca_core
+    adjusted = data.copy()
+    adjusted["Logistics (kg CO2)"] *= 1.5
+    adjusted["Production (kg CO2)"] *= 0.7
+    adjusted[TOTAL_COLUMN] = adjusted[STAGE_COLUMNS].sum(axis=1)
+    return adjusted
+
+
+def _rules():
+    return pd.DataFrame({
+        "Regulation": ["CBAM", "CBAM", "REACH", "REACH"],
+        "Category": [None, CATEGORIES[0], None, CATEGORIES[1]],
+        "Threshold": [120.0, 110.0, 130.0, 100.0],
+    })
+
+
+def computation_cases(csv_path, cache_dir):
+    """(name, callable) pairs timed for one catalog; state is prepared outside the timings."""
+    data = lca_core.validate_products(load_catalog(csv_path, cache_dir=cache_dir))
+    adjusted = lca_core.adjust(data, "Air", "Renewable")
+    tax_model = build_tax_model(data)
+    rules = compile_rules(_rules())
+    schedule = load_price_schedule(os.path.join(REPO_DIR, PRICES_FILE))
+    shipments = export_shipments(adjusted, 20)
+    index = build_footprint_index(adjusted)
+    low, high = index.percentile(25), index.percentile(75)
+    return [
+        ("csv_load.read_csv", lambda: pd.read_csv(csv_path)),
+        ("csv_load.catalog_warm", lambda: load_catalog(csv_path, cache_dir=cache_dir)),
+        ("scenario.legacy_copy_mutate", lambda: _legacy_adjust(data)),
+        ("scenario.adjust", lambda: lca_core.adjust(data, "Air", "Renewable")),
+        ("scenario.all_scenarios", lambda: evaluate_scenarios(data)),
+        ("tax.build_model", lambda: build_tax_model(data)),
+        ("tax.frame", lambda: tax_model.frame(50)),
+        ("tax.curve", lambda: tax_model.tax_curve()),
+        ("compliance.compile_rules", lambda: compile_rules(_rules())),
+        ("compliance.evaluate", lambda: rules.evaluate(adjusted)),
+        ("chart.legacy_melt", lambda: adjusted.melt(id_vars=NAME_COLUMN, value_vars=STAGE_COLUMNS)),
+        ("chart.stage_totals", lambda: stage_totals(adjusted, STAGE_COLUMNS)),
+        ("chart.top_n_with_other", lambda: top_n_with_other(adjusted, NAME_COLUMN, TOTAL_COLUMN)),
+        ("chart.footprint_histogram", lambda: footprint_histogram(adjusted[TOTAL_COLUMN])),
+        ("index.build", lambda: build_footprint_index(adjusted)),
+        ("index.range_query", lambda: index.range_positions(low, high)),
+        ("cbam.liability", lambda: compute_liability(shipments, adjusted, schedule)),
+    ]
+
+
+def api_cases(n_products, api_max):
+    """(name, callable) pairs hitting cbam_audit.py endpoints through Flask's test client."""
+    from cbam_audit import app
+
+    client = app.test_client()
+    n = max(1, min(n_products, api_max))
+    batch = {"submissions": [{"client_id": f"BENCH-{i % 100}", "data": {"emissions": i}} for i in range(n)]}
+    ids = [r["submission_id"] for r in client.post("/submit_batch", json=batch).get_json()["results"]]
+    products = lca_core.adjust(
+        pd.DataFrame({NAME_COLUMN: [f"P{i}" for i in range(n)], **{c: np.ones(n) for c in STAGE_COLUMNS}}),
+        "Road", "Renewable",
+    ).to_dict("records")
+
+    def check(response):
+        if response.status_code != 200:
+            raise RuntimeError(f"{response.request.path} returned {response.status_code}")
+
+    return [
+        ("api.submit_data", lambda: check(client.post("/submit_data", json={"client_id": "BENCH", "data": {"emissions": 1}}))),
+        ("api.submit_batch", lambda: check(client.post("/submit_batch", json=batch))),
+        ("api.approve_batch", lambda: check(client.post("/approve_batch", json={"submission_ids": ids}))),
+        ("api.submission_status", lambda: check(client.get(f"/submission_status/{ids[0]}"))),
+        ("api.client_submissions", lambda: check(client.get("/client_submissions/BENCH-1"))),
+        ("api.compliance_dashboard", lambda: check(client.get("/compliance_dashboard"))),
+        ("api.calculate_footprint", lambda: check(client.post("/calculate_footprint", json={"products": products}))),
+    ], n
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help="Comma-separated catalog sizes; up to 10000000")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--api-max", type=int, default=DEFAULT_API_MAX, help="Largest record count sent to the API")
+    parser.add_argument("--skip-api", action="store_true")
+    parser.add_argument("--output", help="Write the report as JSON to this path")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for n_products in sizes:
+            csv_path = write_catalog_csv(n_products, os.path.join(workdir, f"catalog_{n_products}.csv"))
+            cache_dir = os.path.join(workdir, "cache")
+            start = time.perf_counter()
+            load_catalog(csv_path, cache_dir=cache_dir)
+            cases = [("csv_load.catalog_cold", None, [time.perf_counter() - start], n_products)]
+            cases += [(name, fn, None, n_products) for name, fn in computation_cases(csv_path, cache_dir)]
+            if not args.skip_api:
+                endpoints, n_records = api_cases(n_products, args.api_max)
+                cases += [(name, fn, None, n_records) for name, fn in endpoints]
+
+            for name, fn, runs, records in cases:
+                runs = runs or _time(fn, args.repeat)
+                result = {
+                    "benchmark": name,
+                    "products": n_products,
+                    "records": records,
+                    "median_s": statistics.median(runs),
+                    "min_s": min(runs),
+                    "runs": len(runs),
+                }
+                results.append(result)
+                print(f"{name:<30} {n_products:>10,} products  {result['median_s'] * 1000:10.2f} ms")
+
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=4)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
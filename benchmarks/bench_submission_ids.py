@@ -0,0 +1,64 @@
+"""Collision and throughput check for the CBAM submission ID generator.
+
+Runs several worker processes, each with several threads, generating IDs as fast
+as they can, then checks the combined set for duplicates and per-thread order.
+
+    python benchmarks/bench_submission_ids.py --processes 4 --threads 4 --per-thread 50000
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from id_generator import new_submission_id  # noqa: E402
+
+
+def _generate(threads, per_thread):
+    results = [None] * threads
+
+    def work(slot):
+        results[slot] = [new_submission_id() for _ in range(per_thread)]
+
+    workers = [threading.Thread(target=work, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--per-thread", type=int, default=50_000)
+    parser.add_argument("--target-rate", type=float, default=50_000, help="IDs per second to beat")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.processes) as pool:
+        batches = list(pool.map(_generate, [args.threads] * args.processes, [args.per_thread] * args.processes))
+    elapsed = time.perf_counter() - start
+
+    ids = [sid for batch in batches for thread_ids in batch for sid in thread_ids]
+    collisions = len(ids) - len(set(ids))
+    unordered = sum(
+        1 for batch in batches for thread_ids in batch
+        if any(a >= b for a, b in zip(thread_ids, thread_ids[1:]))
+    )
+    rate = len(ids) / elapsed
+
+    print(f"generated:   {len(ids)} IDs in {elapsed:.2f}s ({rate:,.0f}/s)")
+    print(f"collisions:  {collisions}")
+    print(f"unordered threads: {unordered}")
+    ok = collisions == 0 and unordered == 0 and rate >= args.target_rate
+    print("PASS" if ok else "FAIL")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""Load test for a running CBAM audit API instance.
+
+Fires concurrent /submit_data requests, then /submission_status/<id> requests for
+the IDs it created, and reports requests per second and latency percentiles.
+
+    python serve_cbam.py --workers 4 &
+    python benchmarks/load_test_cbam.py --url http://127.0.0.1:5001 --requests 5000 --concurrency 32
+"""
+import argparse
+import json
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+# Status recorded for requests that got no HTTP response (refused, reset, timed out)
+CONNECTION_ERROR = 0
+
+
+def _timed(req):
+    # Errors are results to count, not reasons to abort the run
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=30) as response:
+            body = response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        body, status = e.read(), e.code
+    except (urllib.error.URLError, OSError):
+        body, status = b"", CONNECTION_ERROR
+    return time.perf_counter() - start, status, body
+
+
+def _submit(url, i):
+    payload = json.dumps({"client_id": f"LOAD-{i % 100}", "data": {"emissions": i}}).encode()
+    req = urllib.request.Request(f"{url}/submit_data", data=payload, headers={"Content-Type": "application/json"})
+    return _timed(req)
+
+
+def _status(url, submission_id):
+    return _timed(urllib.request.Request(f"{url}/submission_status/{submission_id}"))
+
+
+def _percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def _run(name, fn, args, concurrency):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda a: fn(*a), args))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(r[0] for r in results) or [0.0]
+    errors = sum(1 for r in results if r[1] != 200)
+    report = {
+        "endpoint": name,
+        "requests": len(results),
+        "errors": errors,
+        "connection_errors": sum(1 for r in results if r[1] == CONNECTION_ERROR),
+        "rps": len(results) / elapsed,
+        "p50_ms": _percentile(latencies, 0.50) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+        "max_ms": latencies[-1] * 1000,
+    }
+    print(f"{name:<32} {report['rps']:>9.0f} req/s  p50 {report['p50_ms']:7.2f} ms  "
+          f"p99 {report['p99_ms']:7.2f} ms  errors {errors}")
+    return report, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:5001")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--output", help="Write the report as JSON to this path")
+    args = parser.parse_args()
+    url = args.url.rstrip("/")
+
+    submit_report, results = _run("/submit_data", _submit, [(url, i) for i in range(args.requests)], args.concurrency)
+    ids = [json.loads(body)["submission_id"] for _, status, body in results if status == 200]
+    status_report, _ = _run("/submission_status/<id>", _status, [(url, sid) for sid in ids], args.concurrency)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"url": url, "concurrency": args.concurrency, "results": [submit_report, status_report]}, f, indent=4)
+    return 0 if submit_report["errors"] == 0 and status_report["errors"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""Synthetic product catalogs shaped like sano_lca_products.csv, from 10 to 10M rows.
+
+    python benchmarks/synthetic_catalog.py --products 1000000 --output /tmp/catalog_1m.csv
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lca_schema import CATEGORY_COLUMN, NAME_COLUMN, STAGE_COLUMNS, TOTAL_COLUMN  # noqa: E402
+
+CATEGORIES = ["Laundry", "Dishwashing", "Surface Care", "Toilet Care", "Personal Care", "Industrial"]
+PRODUCT_LINES = ["Maxima", "Floor", "Dishwasher", "Anti-Lime", "Toilet", "Glass", "Oven", "Fabric"]
+# Rows generated per chunk when writing CSVs, so 10M rows never sit in memory at once
+CSV_CHUNK_ROWS = 1_000_000
+
+
+def generate_catalog(n_products, seed=0, start=0):
+    """n_products rows with unique names, categories and stage emissions near the sample data."""
+    rng = np.random.default_rng(seed + start)
+    ids = np.arange(start, start + n_products)
+    lines = np.array(PRODUCT_LINES)[ids % len(PRODUCT_LINES)]
+    raw = rng.normal(55, 8, n_products).clip(5)
+    production = rng.normal(34, 6, n_products).clip(2)
+    logistics = rng.normal(23, 5, n_products).clip(1)
+    frame = pd.DataFrame({
+        NAME_COLUMN: np.char.add(np.char.add("Sano ", lines), np.char.add(" #", ids.astype(str))),
+        CATEGORY_COLUMN: np.array(CATEGORIES)[rng.integers(0, len(CATEGORIES), n_products)],
+        STAGE_COLUMNS[0]: raw.round(1),
+        STAGE_COLUMNS[1]: production.round(1),
+        STAGE_COLUMNS[2]: logistics.round(1),
+    })
+    frame[TOTAL_COLUMN] = frame[STAGE_COLUMNS].sum(axis=1).round(1)
+    return frame
+
+
+def write_catalog_csv(n_products, path, seed=0):
+    """Write a synthetic catalog CSV in chunks and return its path."""
+    for start in range(0, n_products, CSV_CHUNK_ROWS):
+        chunk = generate_catalog(min(CSV_CHUNK_ROWS, n_products - start), seed=seed, start=start)
+        chunk.to_csv(path, mode="w" if start == 0 else "a", header=start == 0, index=False)
+    if n_products == 0:
+        generate_catalog(0).to_csv(path, index=False)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", required=True)
+    args = parser.parse_args()
+    write_catalog_csv(args.products, args.output, args.seed)
+    print(f"wrote {args.products:,} products to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# Converted catalogs live next to the source CSV unless another directory is given
+CACHE_DIR_NAME = ".catalog_cache"
+
+# Explicit dtypes for the emission columns; anything else numeric is stored as float64
+COLUMN_DTYPES = {
+    "Raw Material (kg CO2)": "float64",
+    "Production (kg CO2)": "float64",
+    "Logistics (kg CO2)": "float64",
+    "Total Carbon Footprint (kg CO2)": "float64",
+}
+CATEGORICAL_COLUMNS = ["Product Name"]
+
+FORMAT_VERSION = 1
+_HASH_CHUNK = 1 << 20
+
+
+def file_digest(path):
+    """Return the SHA-256 hex digest of a file, read in 1 MiB chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_catalog(csv_path, cache_dir=None):
+    """Load a product catalog CSV through its memory-mapped columnar copy.
+
+    The CSV is parsed only when no converted copy exists or when its content
+    changed. An unchanged mtime skips hashing; a changed mtime with the same
+    hash skips parsing.
+    """
+    csv_path = os.path.abspath(csv_path)
+    stat = os.stat(csv_path)  # Raises FileNotFoundError like pd.read_csv
+    cache_dir = cache_dir or os.path.join(os.path.dirname(csv_path), CACHE_DIR_NAME)
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    manifest_path = os.path.join(cache_dir, f"{stem}.json")
+
+    manifest = _read_manifest(manifest_path)
+    if manifest is not None:
+        if manifest["mtime_ns"] == stat.st_mtime_ns and manifest["size"] == stat.st_size:
+            return _open_columns(cache_dir, manifest)
+        digest = file_digest(csv_path)
+        if manifest["sha256"] == digest:
+            manifest.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            _write_manifest(manifest_path, manifest)
+            return _open_columns(cache_dir, manifest)
+    else:
+        digest = file_digest(csv_path)
+
+    previous = manifest["directory"] if manifest is not None else None
+    manifest = _convert(csv_path, cache_dir, stem, stat, digest)
+    _write_manifest(manifest_path, manifest)
+    # The previous generation stays on disk for readers still holding its manifest
+    _remove_stale(cache_dir, stem, {manifest["directory"], previous})
+    return _open_columns(cache_dir, manifest)
+
+
+def _read_manifest(path):
+    try:
+        with open(path, "r") as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    if manifest.get("format_version") != FORMAT_VERSION:
+        return None
+    return manifest
+
+
+def _write_manifest(path, manifest):
+    # Readers only ever see a complete manifest
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=4)
+    os.replace(tmp_path, path)
+
+
+def _convert(csv_path, cache_dir, stem, stat, digest):
+    dtypes = {name: "category" for name in CATEGORICAL_COLUMNS}
+    dtypes.update(COLUMN_DTYPES)
+    header = pd.read_csv(csv_path, nrows=0).columns
+    data = pd.read_csv(csv_path, dtype={k: v for k, v in dtypes.items() if k in header})
+
+    # Column files go to a directory named after the content digest, so a reader
+    # of the previous manifest keeps a consistent view while this one is built
+    directory = f"{stem}-{digest[:16]}"
+    target = os.path.join(cache_dir, f"{directory}.{os.getpid()}.tmp")
+    os.makedirs(target, exist_ok=True)
+
+    columns = []
+    for i, name in enumerate(data.columns):
+        series = data[name]
+        if not isinstance(series.dtype, pd.CategoricalDtype) and not pd.api.types.is_numeric_dtype(series):
+            series = series.astype("category")
+        column = {"name": name, "file": f"col{i}.npy"}
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            categories = series.cat.categories.to_numpy(dtype=str)
+            np.save(os.path.join(target, f"col{i}.categories.npy"), categories)
+            np.save(os.path.join(target, column["file"]), series.cat.codes.to_numpy(dtype=np.int32))
+            column["kind"] = "categorical"
+        else:
+            dtype = COLUMN_DTYPES.get(name, "float64")
+            np.save(os.path.join(target, column["file"]), series.to_numpy(dtype=dtype))
+            column["kind"] = "numeric"
+        columns.append(column)
+
+    try:
+        os.rename(target, os.path.join(cache_dir, directory))
+    except OSError:
+        # Another process converted the same content first
+        shutil.rmtree(target, ignore_errors=True)
+
+    return {
+        "format_version": FORMAT_VERSION,
+        "source": csv_path,
+        "sha256": digest,
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "rows": len(data),
+        "directory": directory,
+        "columns": columns,
+    }
+
+
+def _open_columns(cache_dir, manifest):
+    target = os.path.join(cache_dir, manifest["directory"])
+    columns = {}
+    for column in manifest["columns"]:
+        values = np.load(os.path.join(target, column["file"]), mmap_mode="r")
+        if column["kind"] == "categorical":
+            categories = np.load(os.path.join(target, column["file"].replace(".npy", ".categories.npy")))
+            values = pd.Categorical.from_codes(np.asarray(values), categories=categories)
+        columns[column["name"]] = values
+    return pd.DataFrame(columns, copy=False)
+
+
+def _remove_stale(cache_dir, stem, keep):
+    """Delete converted directories of this catalog older than the generations in keep."""
+    length = len(f"{stem}-") + 16
+    for entry in os.listdir(cache_dir):
+        if entry.startswith(f"{stem}-") and len(entry) == length and entry not in keep:
+            shutil.rmtree(os.path.join(cache_dir, entry), ignore_errors=True)
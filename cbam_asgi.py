@@ -0,0 +1,7 @@
+from asgiref.wsgi import WsgiToAsgi
+
+from cbam_audit import app
+
+# ASGI entry point for the CBAM audit API, e.g. `uvicorn cbam_asgi:asgi_app`.
+# Flask handlers run in asgiref's thread pool, so the storage layer stays synchronous.
+asgi_app = WsgiToAsgi(app)
@@ -1,10 +1,81 @@
-from flask import Flask, request, jsonify
+import json
+import os
+import time
+import pandas as pd
+from flask import Flask, Response, g, request, jsonify
 from datetime import datetime
+from id_generator import new_submission_id
+from instrumentation import REGISTRY as metrics, SIZE_BUCKETS, SlowRequestProfiler, TimedProxy
+from lca_core import NAME_COLUMN, TOTAL_COLUMN, adjust, carbon_cost, validate_products
+from submission_store import DEFAULT_STORE_URL, DuplicateSubmissionError, open_store
 
 app = Flask(__name__)
 
-# In-memory storage for submissions
-clients_data = {}
+# Submission storage; set CBAM_STORE=memory for a throwaway in-process store.
+# Every store call is timed into storage_op_seconds.
+store = TimedProxy(open_store(os.environ.get('CBAM_STORE', DEFAULT_STORE_URL)), 'storage_op_seconds', metrics)
+
+# Opt-in profiler: CBAM_PROFILE_SLOW_MS=500 writes sampled stacks of slower requests to CBAM_PROFILE_DIR
+profiler = None
+if os.environ.get('CBAM_PROFILE_SLOW_MS'):
+    profiler = SlowRequestProfiler(
+        float(os.environ['CBAM_PROFILE_SLOW_MS']) / 1000,
+        os.environ.get('CBAM_PROFILE_DIR', 'cbam_profiles'),
+        interval=float(os.environ.get('CBAM_PROFILE_INTERVAL_MS', 5)) / 1000,
+    )
+
+metrics.describe('http_requests_total', 'Requests by endpoint, method and status.')
+metrics.describe('http_request_duration_seconds', 'Request latency by endpoint.')
+metrics.describe('http_request_bytes', 'Request body size by endpoint.')
+metrics.describe('http_response_bytes', 'Response body size by endpoint.')
+metrics.describe('storage_op_seconds', 'Submission store call latency by operation.')
+
+# Upper bound on records accepted by one batch request
+MAX_BATCH_SIZE = 50000
+
+def read_batch(key):
+    """Read a batch body: a JSON array, {key: [...]} or NDJSON (one item per line)."""
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        lines = request.get_data(as_text=True).splitlines()
+        return [json.loads(line) for line in lines if line.strip()]
+    body = request.get_json()
+    if isinstance(body, dict):
+        body = body.get(key)
+    if not isinstance(body, list):
+        raise ValueError(f'Expected a JSON array or an object with a "{key}" array.')
+    return body
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    if profiler is not None:
+        profiler.begin()
+
+@app.after_request
+def record_request_metrics(response):
+    """Count and time every request by route template, so IDs in URLs do not explode the labels."""
+    endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+    elapsed = time.perf_counter() - g.get('request_start', time.perf_counter())
+    metrics.inc('http_requests_total', endpoint=endpoint, method=request.method, status=response.status_code)
+    metrics.observe('http_request_duration_seconds', elapsed, endpoint=endpoint, method=request.method)
+    metrics.observe('http_request_bytes', request.content_length or 0, buckets=SIZE_BUCKETS, endpoint=endpoint)
+    metrics.observe('http_response_bytes', response.calculate_content_length() or 0,
+                    buckets=SIZE_BUCKETS, endpoint=endpoint)
+    return response
+
+@app.teardown_request
+def finish_profile(error=None):
+    # Runs even when a handler raised, so the profiler never keeps a stale entry
+    if profiler is not None:
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        profiler.end(f'{request.method} {endpoint}')
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus text exposition of this worker's metrics, or JSON with ?format=json."""
+    if request.args.get('format') == 'json':
+        return jsonify(metrics.snapshot()), 200
+    return Response(metrics.prometheus_text(prefix='cbam_'), mimetype='text/plain; version=0.0.4')
 
 @app.route('/submit_data', methods=['POST'])
 def submit_data():
@@ -16,13 +87,16 @@ def submit_data():
         return jsonify({'error': 'Client ID and data are required.'}), 400
 
     # Generate a unique submission ID
-    submission_id = f"SUB-{datetime.now().strftime('%Y%m%d%H%M%S')}"
-    clients_data[submission_id] = {
-        'client_id': client_id,
-        'data': data,
-        'status': 'Pending',
-        'timestamp': datetime.now().isoformat()
-    }
+    submission_id = new_submission_id()
+    try:
+        store.add(submission_id, {
+            'client_id': client_id,
+            'data': data,
+            'status': 'Pending',
+            'timestamp': datetime.now().isoformat()
+        })
+    except DuplicateSubmissionError:
+        return jsonify({'error': 'Submission ID already exists, please retry.'}), 409
 
     return jsonify({'submission_id': submission_id, 'status': 'Data submitted successfully.'}), 200
 
@@ -31,36 +105,137 @@ def approve_submission():
     """Endpoint to approve a submission by ID."""
     submission_id = request.json.get('submission_id')
 
-    if not submission_id or submission_id not in clients_data:
+    # Approve the submission
+    if not submission_id or not store.set_status(submission_id, 'Approved'):
         return jsonify({'error': 'Submission ID not found.'}), 404
 
-    # Approve the submission
-    clients_data[submission_id]['status'] = 'Approved'
     certificate = f"CERT-{submission_id}"
     return jsonify({'submission_id': submission_id, 'certificate': certificate, 'status': 'Approved'}), 200
 
+@app.route('/submit_batch', methods=['POST'])
+def submit_batch():
+    """Submit many records at once; valid records are written in one transaction."""
+    try:
+        records = read_batch('submissions')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if len(records) > MAX_BATCH_SIZE:
+        return jsonify({'error': f'Batch exceeds {MAX_BATCH_SIZE} records.'}), 413
+
+    results = []
+    items = []
+    timestamp = datetime.now().isoformat()
+    for index, record in enumerate(records):
+        client_id = record.get('client_id') if isinstance(record, dict) else None
+        data = record.get('data') if isinstance(record, dict) else None
+        if not client_id or not data:
+            results.append({'index': index, 'error': 'Client ID and data are required.'})
+            continue
+        submission_id = new_submission_id()
+        items.append((submission_id, {
+            'client_id': client_id,
+            'data': data,
+            'status': 'Pending',
+            'timestamp': timestamp
+        }))
+        results.append({'index': index, 'submission_id': submission_id, 'status': 'Pending'})
+
+    try:
+        store.add_many(items)
+    except DuplicateSubmissionError:
+        return jsonify({'error': 'Submission ID already exists, please retry.'}), 409
+
+    return jsonify({'accepted': len(items), 'rejected': len(records) - len(items), 'results': results}), 200
+
+@app.route('/approve_batch', methods=['POST'])
+def approve_batch():
+    """Approve many submissions in one transaction and issue their certificates."""
+    try:
+        entries = read_batch('submission_ids')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if len(entries) > MAX_BATCH_SIZE:
+        return jsonify({'error': f'Batch exceeds {MAX_BATCH_SIZE} records.'}), 413
+
+    # NDJSON lines may be bare IDs or {"submission_id": ...} objects
+    submission_ids = [entry.get('submission_id') if isinstance(entry, dict) else entry for entry in entries]
+    approved = store.set_status_many([sid for sid in submission_ids if isinstance(sid, str)], 'Approved')
+
+    results = []
+    for submission_id in submission_ids:
+        if not isinstance(submission_id, str):
+            results.append({'submission_id': submission_id, 'error': 'Submission ID must be a string.', 'status': 'Invalid'})
+        elif submission_id in approved:
+            results.append({'submission_id': submission_id, 'certificate': f"CERT-{submission_id}", 'status': 'Approved'})
+        else:
+            results.append({'submission_id': submission_id, 'error': 'Submission ID not found.', 'status': 'Not Found'})
+
+    return jsonify({
+        'approved': len(approved),
+        'not_found': sum(result['status'] == 'Not Found' for result in results),
+        'invalid': sum(result['status'] == 'Invalid' for result in results),
+        'results': results,
+    }), 200
+
+@app.route('/calculate_footprint', methods=['POST'])
+def calculate_footprint():
+    """Scenario-adjusted footprints and carbon tax for posted products, via the shared LCA core."""
+    body = request.get_json(silent=True)
+    if body is None:
+        body = {}
+    if not isinstance(body, dict):
+        return jsonify({'error': 'Request body must be a JSON object.'}), 400
+    try:
+        products = validate_products(pd.DataFrame(body.get('products') or []))
+        adjusted = adjust(products, body.get('transport_type', 'Road'), body.get('energy_source', 'Renewable'))
+        rate = float(body.get('carbon_tax_rate', 25))
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({'error': str(e.args[0]) if e.args else str(e)}), 400
+
+    footprints = adjusted[TOTAL_COLUMN].to_numpy()
+    taxes = carbon_cost(footprints, rate)
+    return jsonify({
+        'products': [
+            {'product_name': name, 'footprint_kg': footprint, 'carbon_tax': tax}
+            for name, footprint, tax in zip(adjusted[NAME_COLUMN].astype(str), footprints.tolist(), taxes.tolist())
+        ],
+        'total_footprint_kg': float(footprints.sum()),
+        'total_carbon_tax': float(taxes.sum()),
+    }), 200
+
 @app.route('/compliance_dashboard', methods=['GET'])
 def compliance_dashboard():
-    """Provide a summary of the compliance dashboard."""
-    total_submissions = len(clients_data)
-    approved_submissions = sum(1 for item in clients_data.values() if item['status'] == 'Approved')
+    """Provide a summary of the compliance dashboard from the store's maintained views."""
+    summary = store.summary()
+    total_submissions = summary['total_submissions']
+    approved_submissions = summary['by_status'].get('Approved', 0)
     pending_submissions = total_submissions - approved_submissions
 
     return jsonify({
         'dashboard': {
             'total_submissions': total_submissions,
             'approved': approved_submissions,
-            'pending': pending_submissions
+            'pending': pending_submissions,
+            'by_status': summary['by_status'],
+            'by_client': summary['by_client'],
+            'by_day': summary['by_day'],
+            'total_emissions': summary['total_emissions'],
         }
     }), 200
 
 @app.route('/submission_status/<submission_id>', methods=['GET'])
 def submission_status(submission_id):
     """Get the status of a specific submission."""
-    if submission_id not in clients_data:
+    submission = store.get(submission_id)
+    if submission is None:
         return jsonify({'error': 'Submission ID not found.'}), 404
 
-    return jsonify(clients_data[submission_id]), 200
+    return jsonify(submission), 200
+
+@app.route('/client_submissions/<client_id>', methods=['GET'])
+def client_submissions(client_id):
+    """List every submission of one client."""
+    return jsonify({'client_id': client_id, 'submissions': store.by_client(client_id)}), 200
 
 if __name__ == '__main__':
     app.run(debug=True, port=5001)
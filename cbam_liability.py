@@ -0,0 +1,200 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from lca_schema import KG_PER_TON, NAME_COLUMN, TOTAL_COLUMN
+
+PRICES_FILE = "cbam_prices.json"
+
+# Shipment table columns; Year is optional and defaults to the current year
+DESTINATION_COLUMN = "Destination"
+QUANTITY_COLUMN = "Quantity"
+YEAR_COLUMN = "Year"
+SHIPMENT_COLUMNS = [NAME_COLUMN, DESTINATION_COLUMN, QUANTITY_COLUMN]
+
+# Destinations inside the CBAM scope: EU member states by ISO code, or "EU" itself
+EU_DESTINATIONS = frozenset({
+    "EU", "AT", "BE", "BG", "HR", "CY", "CZ", "DK", "EE", "FI", "FR", "DE", "GR", "HU", "IE",
+    "IT", "LV", "LT", "LU", "MT", "NL", "PL", "PT", "RO", "SK", "SI", "ES", "SE",
+})
+
+# Results kept by liability_for, keyed by (schedule content digest, dataset version)
+MAX_CACHED_RESULTS = 16
+
+
+class PriceSchedule:
+    """EU ETS price and CBAM phase-in share by year, looked up for many years at once.
+
+    A year uses the latest entry at or before it. Years before the first price
+    use the first price; years before the first phase-in entry owe nothing.
+    """
+
+    def __init__(self, prices, phase_in, version=None):
+        self.price_years = np.array(sorted(int(year) for year in prices))
+        self.prices = np.array([float(prices[key]) for key in sorted(prices, key=int)])
+        self.phase_years = np.array(sorted(int(year) for year in phase_in))
+        self.phase_shares = np.array([float(phase_in[key]) for key in sorted(phase_in, key=int)])
+        # Digest of the values themselves, so edited prices are never mistaken for a cached schedule
+        digest = hashlib.sha256()
+        for values in (self.price_years, self.prices, self.phase_years, self.phase_shares):
+            digest.update(values.tobytes())
+            digest.update(b"|")
+        self.digest = digest.hexdigest()
+        self.version = version if version is not None else self.digest
+
+    def price(self, years):
+        positions = np.searchsorted(self.price_years, years, side="right") - 1
+        return self.prices[np.clip(positions, 0, None)]
+
+    def phase_in(self, years):
+        positions = np.searchsorted(self.phase_years, years, side="right") - 1
+        return np.where(positions >= 0, self.phase_shares[np.clip(positions, 0, None)], 0.0)
+
+
+def load_price_schedule(path=PRICES_FILE):
+    with open(path, "r") as f:
+        schedule = json.load(f)
+    return PriceSchedule(schedule["prices"], schedule["phase_in"], version=str(schedule["version"]))
+
+
+_schedules = {}
+_schedules_lock = threading.Lock()
+
+
+def price_schedule_for(path=PRICES_FILE):
+    """load_price_schedule, re-read only when the file changes; shared by every dashboard session."""
+    stat = os.stat(path)
+    key = os.path.abspath(path)
+    file_version = (stat.st_mtime_ns, stat.st_size)
+    with _schedules_lock:
+        cached = _schedules.get(key)
+        if cached is not None and cached[0] == file_version:
+            return cached[1]
+    schedule = load_price_schedule(path)
+    with _schedules_lock:
+        _schedules[key] = (file_version, schedule)
+    return schedule
+
+
+class LiabilityResult:
+    """CBAM obligations grouped by product and destination, plus catalog totals."""
+
+    def __init__(self, by_product, by_year, unmatched_rows):
+        self.by_product = by_product
+        self.by_year = by_year
+        self.unmatched_rows = unmatched_rows
+        self.certificates = float(by_product["CBAM Certificates (t CO2)"].sum())
+        self.cost = float(by_product["CBAM Cost (€)"].sum())
+        self.embedded_tons = float(by_product["Embedded Emissions (t CO2)"].sum())
+
+
+def _codes(column):
+    # Factorize once so per-row lookups become gathers on the distinct values
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return column.cat.codes.to_numpy(), column.cat.categories
+    return pd.factorize(column)
+
+
+def compute_liability(shipments, products, schedule):
+    """Certificate obligations and cost for a shipment table, fully vectorized.
+
+    Each shipment's embedded emissions are its quantity times the product's
+    footprint per unit. Only EU destinations owe certificates, scaled by the
+    phase-in share of the shipment year and priced at that year's ETS price.
+    Shipments of products missing from the catalog are counted, not priced.
+    """
+    missing = [column for column in SHIPMENT_COLUMNS if column not in shipments.columns]
+    if missing:
+        raise ValueError(f"Missing shipment columns: {missing}")
+
+    name_codes, names = _codes(shipments[NAME_COLUMN])
+    footprint_table = pd.Series(
+        products[TOTAL_COLUMN].to_numpy(dtype=np.float64), index=products[NAME_COLUMN].astype(str)
+    )
+    footprint_table = footprint_table[~footprint_table.index.duplicated()]
+    unit_kg = np.append(footprint_table.reindex(pd.Index(names).astype(str)).to_numpy(), np.nan)[name_codes]
+
+    destination_codes, destinations = _codes(shipments[DESTINATION_COLUMN])
+    in_scope = np.append(pd.Index(destinations).astype(str).str.upper().isin(EU_DESTINATIONS), False)[destination_codes]
+
+    if YEAR_COLUMN in shipments.columns:
+        years = shipments[YEAR_COLUMN].to_numpy(dtype=np.int64)
+    else:
+        years = np.full(len(shipments), date.today().year)
+
+    matched = ~np.isnan(unit_kg)
+    quantity = shipments[QUANTITY_COLUMN].to_numpy(dtype=np.float64)
+    embedded = np.where(matched, quantity * unit_kg, 0.0) / KG_PER_TON
+    certificates = embedded * in_scope * schedule.phase_in(years)
+    cost = certificates * schedule.price(years)
+
+    rows = pd.DataFrame({
+        "product": name_codes,
+        "destination": destination_codes,
+        "year": years,
+        "shipments": matched.astype(np.int64),
+        "quantity": np.where(matched, quantity, 0.0),
+        "embedded": embedded,
+        "certificates": certificates,
+        "cost": cost,
+    })[matched]
+    sums = ["shipments", "quantity", "embedded", "certificates", "cost"]
+    grouped = rows.groupby(["product", "destination"], sort=False)[sums].sum().reset_index()
+    by_product = pd.DataFrame({
+        NAME_COLUMN: np.asarray(names)[grouped["product"].to_numpy()],
+        DESTINATION_COLUMN: np.asarray(destinations)[grouped["destination"].to_numpy()],
+        "Shipments": grouped["shipments"].to_numpy(),
+        QUANTITY_COLUMN: grouped["quantity"].to_numpy(),
+        "Embedded Emissions (t CO2)": grouped["embedded"].to_numpy(),
+        "CBAM Certificates (t CO2)": grouped["certificates"].to_numpy(),
+        "CBAM Cost (€)": grouped["cost"].to_numpy(),
+    })
+    by_year = rows.groupby("year")[["embedded", "certificates", "cost"]].sum().rename(columns={
+        "embedded": "Embedded Emissions (t CO2)",
+        "certificates": "CBAM Certificates (t CO2)",
+        "cost": "CBAM Cost (€)",
+    }).rename_axis(YEAR_COLUMN).reset_index()
+    return LiabilityResult(by_product, by_year, int((~matched).sum()))
+
+
+def export_shipments(products, export_ratio, year=None, destination="EU"):
+    """One shipment per product carrying export_ratio percent of its footprint unit to the EU.
+
+    Used when no shipment data is available, so the dashboards' export slider
+    still yields a liability estimate.
+    """
+    return pd.DataFrame({
+        NAME_COLUMN: products[NAME_COLUMN].to_numpy(),
+        DESTINATION_COLUMN: destination,
+        QUANTITY_COLUMN: export_ratio / 100,
+        YEAR_COLUMN: year or date.today().year,
+    })
+
+
+_results = OrderedDict()
+_results_lock = threading.Lock()
+
+
+def liability_for(shipments, products, schedule, dataset_version):
+    """compute_liability cached per (schedule contents, dataset version).
+
+    dataset_version must change whenever the shipments or the product
+    footprints (including the selected scenario) do.
+    """
+    key = (schedule.digest, dataset_version)
+    with _results_lock:
+        if key in _results:
+            _results.move_to_end(key)
+            return _results[key]
+    result = compute_liability(shipments, products, schedule)
+    with _results_lock:
+        _results[key] = result
+        while len(_results) > MAX_CACHED_RESULTS:
+            _results.popitem(last=False)
+    return result
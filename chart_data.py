@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from lca_schema import TOTAL_COLUMN
+
+# Bars shown per chart before the remainder is folded into "Other"
+CHART_TOP_N = 25
+HISTOGRAM_BINS = 40
+
+
+def top_n_with_other(frame, name_column, value_column, n=CHART_TOP_N):
+    """The n largest rows by value, largest first, plus one "Other" row summing the rest.
+
+    Frames with at most n rows are returned unchanged apart from column selection.
+    """
+    if len(frame) <= n:
+        return frame[[name_column, value_column]]
+
+    values = frame[value_column].to_numpy()
+    top = np.argpartition(values, len(values) - n)[-n:]
+    top = top[np.argsort(values[top])[::-1]]
+    rest = len(values) - n
+    other_value = values.sum() - values[top].sum()
+    return pd.DataFrame({
+        name_column: [*frame[name_column].to_numpy()[top].astype(str), f"Other ({rest:,} products)"],
+        value_column: [*values[top], other_value],
+    })
+
+
+def stage_totals(frame, stage_columns, category_name="Category", value_name="Emissions (kg CO2)"):
+    """One row per lifecycle stage with its catalog-wide sum, for pie charts."""
+    return pd.DataFrame({
+        category_name: stage_columns,
+        value_name: frame[stage_columns].sum().to_numpy(),
+    })
+
+
+def footprint_histogram(values, bins=HISTOGRAM_BINS, value_name=TOTAL_COLUMN):
+    """Bin centers and product counts for a footprint distribution."""
+    counts, edges = np.histogram(np.asarray(values, dtype=np.float64), bins=bins)
+    return pd.DataFrame({
+        value_name: (edges[:-1] + edges[1:]) / 2,
+        "Products": counts,
+        "Bin Width": np.diff(edges),
+    })
+
+
+def search_products(frame, name_column, query, limit=50):
+    """Rows whose name contains query (case-insensitive), capped for drill-down views."""
+    if not query:
+        return frame.iloc[:0]
+    names = frame[name_column].astype(str)
+    return frame[names.str.contains(query, case=False, regex=False)].head(limit)
@@ -1,9 +1,21 @@
 import os
+import numpy as np
 import pandas as pd
 import streamlit as st
 import plotly.express as px
-import json  # For handling audit data
-from datetime import datetime  # For timestamps
+from audit_store import AUDIT_COLUMNS, AuditStore
+from lca_core import KG_PER_TON, NAME_COLUMN, STAGE_COLUMNS, TAX_COLUMN, TONS_COLUMN, catalog_for, load_products, scenario_factors, validate_products
+from financials import TAX_RATES
+from monte_carlo import STAGE_UNCERTAINTY, simulate
+from dashboard_components import metrics_panel, paged_table, show_chart, show_dataframe
+from instrumentation import REGISTRY as metrics, instrument_cache, start_trace
+from chart_data import CHART_TOP_N, footprint_histogram, search_products, stage_totals, top_n_with_other
+from recompute_graph import ComputeGraph
+from footprint_index import build_footprint_index
+from ingest import STREAMING_THRESHOLD_BYTES, ingest_csv
+from upload_cache import UploadCache, stream_digest
+from cbam_liability import PRICES_FILE, export_shipments, liability_for, price_schedule_for
+from regulation_index import REGULATION_COLUMNS, REGULATIONS_FILE, build_regulation_index
 
 # Automatically change the working directory to the script's directory
 os.chdir(os.path.dirname(__file__))
@@ -60,35 +72,144 @@ if not st.session_state.start:
     )
     st.stop()
 
-# Load dataset
-@st.cache_data
+# Timing panel for admins (CLEAR_ADMIN=1); CLEAR_METRICS_LOG appends every rerun to a JSON-lines file
+ADMIN_MODE = os.environ.get("CLEAR_ADMIN") == "1"
+METRICS_LOG = os.environ.get("CLEAR_METRICS_LOG")
+rerun_trace = start_trace("rerun") if ADMIN_MODE or METRICS_LOG else None
+
+# Load dataset; lca_core caches the catalog per file version for every session
+@metrics.timed("load_data")
 def load_data(file_path):
     try:
-        return pd.read_csv(file_path)
+        return load_products(file_path)
     except FileNotFoundError:
         st.error(f"File not found: {file_path}")
-        return pd.DataFrame()
+        return None
+
+@instrument_cache(st.cache_data(max_entries=8), "run_simulation")
+def run_simulation(data, n_draws, confidence, uncertainty, carbon_price, seed):
+    return simulate(data, n_draws, confidence, uncertainty, carbon_price, seed)
+
+def build_compute_graph():
+    graph = ComputeGraph(max_entries=16, metrics=metrics)
+    for name in ("data", "data_version", "transport_type", "energy_source"):
+        graph.input(name)
+    # Scenarios and the tax model are built once per dataset version and shared by every session
+    graph.add("catalog", ["data", "data_version"], catalog_for)
+    graph.add("scenarios", ["catalog"], lambda catalog: catalog.scenarios())
+    graph.add("adjusted_data", ["scenarios", "transport_type", "energy_source"],
+              lambda scenarios, transport, energy: scenarios.frame(transport, energy))
+    graph.add("stage_totals", ["adjusted_data"], lambda adjusted: stage_totals(
+        adjusted, ["Raw Material (kg CO2)", "Production (kg CO2)", "Logistics (kg CO2)"]))
+    graph.add("emissions_top", ["adjusted_data"], lambda adjusted: top_n_with_other(
+        adjusted, "Product Name", "Total Carbon Footprint (kg CO2)"))
+    graph.add("footprint_index", ["adjusted_data"], build_footprint_index)
+    graph.add("footprint_histogram", ["adjusted_data"], lambda adjusted: footprint_histogram(
+        adjusted["Total Carbon Footprint (kg CO2)"]))
+    graph.add("tax_model", ["catalog"], lambda catalog: catalog.tax_model())
+    # Tax is linear in the rate, so tables and rankings are built on tons once and scaled per rerun
+    graph.add("tons_table", ["tax_model"], lambda model: model.tons_frame())
+    graph.add("tons_index", ["tons_table"], lambda tons: build_footprint_index(tons, TONS_COLUMN))
+    graph.add("tons_top", ["tons_table"], lambda tons: top_n_with_other(tons, NAME_COLUMN, TONS_COLUMN))
+    graph.add("tax_curve", ["tax_model"], lambda model: pd.DataFrame(
+        {"Carbon Tax Rate (€/ton)": TAX_RATES, "Total Carbon Tax (€)": model.tax_curve()}))
+    return graph
+
+@st.cache_resource
+def get_upload_cache():
+    # Disk-backed and keyed by content, so it survives restarts and is shared across processes
+    return UploadCache()
+
+def upload_digest(uploaded_file, slot="upload"):
+    # Hash each upload once per session; reruns reuse the digest
+    if st.session_state.get(f"{slot}_digest_id") != uploaded_file.file_id:
+        st.session_state[f"{slot}_digest"] = stream_digest(uploaded_file)
+        st.session_state[f"{slot}_digest_id"] = uploaded_file.file_id
+    return st.session_state[f"{slot}_digest"]
 
-@st.cache_data
 def process_uploaded_data(uploaded_file):
+    uploaded_file.seek(0)
+    return validate_products(pd.read_csv(uploaded_file))
+
+def stream_uploaded_data(uploaded_file):
+    # Large uploads are streamed and reduced to bounded aggregates
+    uploaded_file.seek(0)
+    progress_bar = st.sidebar.progress(0.0, text="Reading upload...")
     try:
-        return pd.read_csv(uploaded_file)
-    except Exception as e:
-        st.error(f"Error reading file: {e}")
-        return pd.DataFrame()
+        return ingest_csv(
+            uploaded_file, progress=lambda fraction: progress_bar.progress(fraction, text="Reading upload...")
+        )
+    finally:
+        progress_bar.empty()
+
+@st.cache_resource
+def get_audit_store():
+    # Shared by all sessions; the legacy JSON file is imported on first use
+    store = AuditStore()
+    store.import_json("audit_data.json")
+    return store
+
+AUDIT_PAGE_SIZE = 50
+
+@instrument_cache(st.cache_resource, "load_regulation_index")
+def load_regulation_index(path, mtime):
+    # Compiled once per rules file version; the mtime argument invalidates edits
+    return build_regulation_index(path)
 
 # Sidebar Data Upload
 st.sidebar.header("Data Management")
 data_file = st.sidebar.file_uploader("Upload a CSV File", type=["csv"])
-if data_file:
-    data = process_uploaded_data(data_file)
+upload_summary = None
+if data_file and data_file.size > STREAMING_THRESHOLD_BYTES:
+    try:
+        upload_summary = get_upload_cache().get_or_compute(
+            upload_digest(data_file), "summary-v2", lambda: stream_uploaded_data(data_file)
+        )
+        data_version = ("upload-summary", upload_digest(data_file))
+    except ValueError as e:
+        st.error(f"Error reading file: {e}")
+        st.stop()
+    data = upload_summary.top_products
+    st.sidebar.info(
+        f"Large upload: {upload_summary.rows:,} products streamed "
+        f"({upload_summary.invalid_rows:,} invalid rows skipped), "
+        f"{upload_summary.total_emissions / 1000:,.2f} tons CO2 in total. "
+        f"Totals cover every product; per-product views show the {len(data):,} highest-footprint products."
+    )
+elif data_file:
+    try:
+        data = get_upload_cache().get_or_compute(
+            upload_digest(data_file), "frame", lambda: process_uploaded_data(data_file)
+        )
+        data_version = ("upload", upload_digest(data_file))
+    except Exception as e:
+        st.error(f"Error reading file: {e}")
+        data = pd.DataFrame()
+        data_version = None
 else:
-    data = load_data("sano_lca_products.csv")
+    catalog = load_data("sano_lca_products.csv")
+    data = catalog.products if catalog is not None else pd.DataFrame()
+    data_version = catalog.version if catalog is not None else None
 
 if data.empty:
     st.error("Dataset could not be loaded. Please ensure the CSV file is available.")
     st.stop()
 
+def top_n_notice():
+    # Views computed from per-product rows only see the streamed top-N of a large upload
+    if upload_summary is not None:
+        st.info(
+            f"Large upload: per-product tables, charts, liability, compliance and simulations below cover only the "
+            f"{len(data):,} highest-footprint of {upload_summary.rows:,} products."
+        )
+
+# Derived tables are recomputed only when the data or the widgets they depend on change
+if "compute_graph" not in st.session_state:
+    st.session_state.compute_graph = build_compute_graph()
+compute_graph = st.session_state.compute_graph
+compute_graph.set_input("data", data, version=data_version)
+compute_graph.set_input("data_version", data_version)
+
 # Header Section
 col_logo, col_title = st.columns([1, 4])
 with col_logo:
@@ -101,11 +222,12 @@ with col_title:
 
 # Sidebar Navigation
 st.sidebar.header("Navigation")
-selected_tab = st.sidebar.radio("Select a tab:", ["Environmental Analysis", "Financial Analysis", "Regulatory Compliance", "Audit Progress"])
+selected_tab = st.sidebar.radio("Select a tab:", ["Environmental Analysis", "Financial Analysis", "Regulatory Compliance", "Model Simulation", "Audit Progress"])
 
 # Environmental Analysis Tab
 if selected_tab == "Environmental Analysis":
     st.header("🌿 Environmental Analysis")
+    top_n_notice()
 
     # Scenario Modeling Sliders
     st.sidebar.header("Adjust Parameters")
@@ -113,44 +235,40 @@ if selected_tab == "Environmental Analysis":
     energy_source = st.sidebar.selectbox("Energy Source", ["Renewable", "Non-renewable"], key="energy")
     export_ratio = st.sidebar.slider("Percent of Products Exported to EU", 0, 100, 20, key="export")
 
-    # Adjust emissions based on scenario inputs
-    adjusted_data = data.copy()
-    if transport_type == "Air":
-        adjusted_data["Logistics (kg CO2)"] *= 1.5
-    elif transport_type == "Sea":
-        adjusted_data["Logistics (kg CO2)"] *= 0.8
-
-    if energy_source == "Renewable":
-        adjusted_data["Production (kg CO2)"] *= 0.7
-    else:
-        adjusted_data["Production (kg CO2)"] *= 1.2
-
-    # Update Total Carbon Footprint
-    adjusted_data["Total Carbon Footprint (kg CO2)"] = (
-        adjusted_data["Raw Material (kg CO2)"] +
-        adjusted_data["Production (kg CO2)"] +
-        adjusted_data["Logistics (kg CO2)"]
-    )
+    # Slice the selected scenario out of the precomputed grid
+    compute_graph.set_input("transport_type", transport_type)
+    compute_graph.set_input("energy_source", energy_source)
+    adjusted_data = compute_graph.get("adjusted_data")
 
     # Display Adjusted Metrics
     st.subheader("Adjusted Emissions Data")
-    st.dataframe(adjusted_data[["Product Name", "Raw Material (kg CO2)", "Production (kg CO2)", "Logistics (kg CO2)", "Total Carbon Footprint (kg CO2)"]])
+    paged_table(adjusted_data[["Product Name", "Raw Material (kg CO2)", "Production (kg CO2)", "Logistics (kg CO2)", "Total Carbon Footprint (kg CO2)"]], key="adjusted_table",
+                index=compute_graph.get("footprint_index"))
 
     # Emissions Breakdown Pie Chart
     st.subheader("Emissions Breakdown by Category")
+    if upload_summary is not None:
+        # Streamed stage sums cover every product; scenarios scale each stage linearly
+        pie_data = pd.DataFrame({
+            "Category": STAGE_COLUMNS,
+            "Emissions (kg CO2)": upload_summary.stage_totals[STAGE_COLUMNS].to_numpy()
+            * scenario_factors(transport_type, energy_source),
+        })
+    else:
+        pie_data = compute_graph.get("stage_totals")
     pie_chart = px.pie(
-        adjusted_data.melt(id_vars="Product Name", value_vars=["Raw Material (kg CO2)", "Production (kg CO2)", "Logistics (kg CO2)"], var_name="Category", value_name="Emissions (kg CO2)"),
+        pie_data,
         values="Emissions (kg CO2)",
         names="Category",
         title="Emissions Distribution",
         color_discrete_sequence=px.colors.sequential.RdBu
     )
-    st.plotly_chart(pie_chart, use_container_width=True)
+    show_chart(pie_chart, "pie_chart")
 
-    # Bar Chart for Per-Product Emissions
+    # Bar Chart for Per-Product Emissions, largest products plus an "Other" bucket
     st.subheader("Per-Product Emissions Comparison")
     bar_chart = px.bar(
-        adjusted_data,
+        compute_graph.get("emissions_top"),
         x="Product Name",
         y="Total Carbon Footprint (kg CO2)",
         title="Total Emissions by Product",
@@ -158,34 +276,114 @@ if selected_tab == "Environmental Analysis":
         color="Total Carbon Footprint (kg CO2)",
         color_continuous_scale=px.colors.sequential.Blues
     )
-    st.plotly_chart(bar_chart, use_container_width=True)
+    show_chart(bar_chart, "emissions_bar_chart")
+
+    # Footprint distribution across all products
+    if len(adjusted_data) > CHART_TOP_N:
+        st.subheader("Footprint Distribution")
+        histogram_chart = px.bar(
+            compute_graph.get("footprint_histogram"),
+            x="Total Carbon Footprint (kg CO2)",
+            y="Products",
+            title="Products by Total Emissions",
+            color_discrete_sequence=px.colors.sequential.Blues[-3:]
+        )
+        histogram_chart.update_layout(bargap=0)
+        show_chart(histogram_chart, "histogram_chart")
+
+    # CBAM liability of EU-bound volumes, from uploaded shipments or the export slider
+    st.subheader("CBAM Liability")
+    # ETS prices and CBAM phase-in, reloaded only when the file changes
+    cbam_schedule = price_schedule_for(PRICES_FILE)
+    shipments_file = st.sidebar.file_uploader("Upload shipments CSV (optional)", type=["csv"], key="shipments")
+    try:
+        if shipments_file:
+            shipments_digest = upload_digest(shipments_file, slot="shipments")
+            shipments = get_upload_cache().get_or_compute(
+                shipments_digest, "shipments", lambda: pd.read_csv(shipments_file)
+            )
+            shipments_version = ("shipments", shipments_digest)
+            st.caption(f"{len(shipments):,} uploaded shipments; the export slider is not used.")
+        else:
+            shipments = export_shipments(adjusted_data, export_ratio)
+            shipments_version = ("export", export_ratio)
+            st.caption(f"Estimated from {export_ratio}% of each product exported to the EU this year.")
+        liability = liability_for(shipments, adjusted_data, cbam_schedule,
+                                  (data_version, transport_type, energy_source, shipments_version))
+    except (ValueError, TypeError) as e:
+        # pandas' ParserError and EmptyDataError are ValueErrors
+        st.error(f"Invalid shipments file: {e}")
+    else:
+        col_embedded, col_certificates, col_cost = st.columns(3)
+        col_embedded.metric("Embedded Emissions Shipped (t CO2)", f"{liability.embedded_tons:,.2f}")
+        col_certificates.metric("CBAM Certificates (t CO2)", f"{liability.certificates:,.2f}")
+        col_cost.metric("CBAM Cost (€)", f"€{liability.cost:,.2f}")
+        if liability.unmatched_rows:
+            st.warning(f"{liability.unmatched_rows:,} shipments name products missing from the catalog.")
+        paged_table(liability.by_product, key="cbam_table", value_column="CBAM Cost (€)")
+        if len(liability.by_year) > 1:
+            show_dataframe(liability.by_year, "by_year")
+
+    # Drill-down to full-resolution product data
+    with st.expander("Drill down into individual products"):
+        product_query = st.text_input("Search products by name", key="drilldown_query")
+        matches = search_products(adjusted_data, "Product Name", product_query)
+        if product_query and matches.empty:
+            st.info("No products match the search.")
+        elif not matches.empty:
+            show_dataframe(matches, "matches")
+            drilldown_chart = px.bar(
+                matches,
+                x="Product Name",
+                y=["Raw Material (kg CO2)", "Production (kg CO2)", "Logistics (kg CO2)"],
+                title="Stage Emissions of Matching Products",
+                labels={"value": "Emissions (kg CO2)", "variable": "Category"},
+                color_discrete_sequence=px.colors.sequential.RdBu
+            )
+            show_chart(drilldown_chart, "drilldown_chart")
 
 # Financial Analysis Tab
 elif selected_tab == "Financial Analysis":
     st.header("💰 Financial Analysis")
+    top_n_notice()
 
     # Carbon Tax Slider
     carbon_tax_rate = st.slider("Set Carbon Tax Rate (€/ton)", min_value=10, max_value=100, value=25, step=5)
 
-    # Calculate Total Carbon Emissions (tons)
-    data["Total Carbon Footprint (tons)"] = data["Total Carbon Footprint (kg CO2)"] / 1000
-    data["Carbon Tax (€)"] = data["Total Carbon Footprint (tons)"] * carbon_tax_rate
+    # Tonnage, its ranking and index are precomputed per dataset; the rate only scales them
+    tax_model = compute_graph.get("tax_model")
 
-    # Display Metrics
-    total_emissions = data["Total Carbon Footprint (tons)"].sum()
-    total_tax_cost = data["Carbon Tax (€)"].sum()
+    # Display Metrics; a streamed upload's totals come from its aggregates, not the top-N rows
+    if upload_summary is not None:
+        total_emissions = upload_summary.total_emissions / KG_PER_TON
+    else:
+        total_emissions = tax_model.total_tons
+    total_tax_cost = total_emissions * carbon_tax_rate
 
     st.metric(label="Total Carbon Emissions (tons)", value=f"{total_emissions:.2f}")
     st.metric(label="Total Carbon Tax Cost (€)", value=f"€{total_tax_cost:.2f}")
 
+    # Tax Cost Curve across the slider range
+    st.subheader("Total Carbon Tax by Rate")
+    if upload_summary is not None:
+        tax_curve = pd.DataFrame({"Carbon Tax Rate (€/ton)": TAX_RATES,
+                                  "Total Carbon Tax (€)": np.asarray(TAX_RATES, dtype=np.float64) * total_emissions})
+    else:
+        tax_curve = compute_graph.get("tax_curve")
+    curve_chart = px.line(tax_curve, x="Carbon Tax Rate (€/ton)", y="Total Carbon Tax (€)", markers=True)
+    show_chart(curve_chart, "curve_chart")
+
     # Cost Breakdown Table
     st.subheader("Cost Breakdown by Product")
-    st.dataframe(data[["Product Name", "Total Carbon Footprint (tons)", "Carbon Tax (€)"]])
+    paged_table(compute_graph.get("tons_table"), key="cost_table", value_column=TONS_COLUMN,
+                index=compute_graph.get("tons_index"),
+                decorate_page=lambda rows: rows.assign(**{TAX_COLUMN: rows[TONS_COLUMN].to_numpy() * carbon_tax_rate}))
 
-    # Bar Chart for Cost Distribution
+    # Bar Chart for Cost Distribution; the tons ranking is also the tax ranking
     st.subheader("Cost Distribution by Product")
+    tons_top = compute_graph.get("tons_top")
     bar_chart = px.bar(
-        data,
+        pd.DataFrame({NAME_COLUMN: tons_top[NAME_COLUMN], TAX_COLUMN: tons_top[TONS_COLUMN].to_numpy() * carbon_tax_rate}),
         x="Product Name",
         y="Carbon Tax (€)",
         title="Carbon Tax Costs by Product",
@@ -193,33 +391,19 @@ elif selected_tab == "Financial Analysis":
         color="Carbon Tax (€)",
         color_continuous_scale=px.colors.sequential.Blues
     )
-    st.plotly_chart(bar_chart, use_container_width=True)
+    show_chart(bar_chart, "tax_bar_chart")
 
 # Regulatory Compliance Tab
 elif selected_tab == "Regulatory Compliance":
     st.header("📜 Regulatory Compliance Tools")
+    top_n_notice()
 
     # Regulatory Summary Table
     st.subheader("Relevant Regulations for the Chemical Sector")
-    regulations = pd.DataFrame({
-        "Regulation Name": [
-            "CBAM (Carbon Border Adjustment Mechanism)",
-            "TSCA (Toxic Substances Control Act)",
-            "REACH (Registration, Evaluation, Authorization, and Restriction of Chemicals)",
-            "GHS (Globally Harmonized System)",
-            "EPA Clean Air Act"
-        ],
-        "Region": ["European Union", "United States", "European Union", "International", "United States"],
-        "Exposure Level (1-10)": [10, 7, 9, 6, 5],
-        "Description": [
-            "Imposes a carbon tax on imported goods based on their embedded emissions.",
-            "Regulates the introduction and use of new or existing chemicals.",
-            "Ensures high levels of health and environmental protection by tracking chemicals.",
-            "Standardizes classification and labeling of chemicals globally.",
-            "Limits emissions of hazardous air pollutants."
-        ]
-    })
-    st.dataframe(regulations)
+    regulation_index = load_regulation_index(REGULATIONS_FILE, os.path.getmtime(REGULATIONS_FILE))
+    regulations = regulation_index.regulations.rename(columns=REGULATION_COLUMNS)[list(REGULATION_COLUMNS.values())]
+    st.caption(f"Rule set version {regulation_index.version}")
+    show_dataframe(regulations, "regulations")
 
     # Bar Chart for Exposure Levels
     st.subheader("Exposure Levels by Regulation")
@@ -232,21 +416,65 @@ elif selected_tab == "Regulatory Compliance":
         color="Exposure Level (1-10)",
         color_continuous_scale=px.colors.sequential.Emrld
     )
-    st.plotly_chart(exposure_chart, use_container_width=True)
+    show_chart(exposure_chart, "exposure_chart")
+
+    # Per-product exposure for the selected markets
+    st.subheader("Regulatory Exposure by Product")
+    all_regions = list(dict.fromkeys(regulation_index.regions))
+    markets = st.multiselect("Markets", all_regions, default=all_regions)
+    show_dataframe(regulation_index.exposure_summary(data, markets), "exposure_summary")
+
+# Model Simulation Tab
+elif selected_tab == "Model Simulation":
+    st.header("🎲 Model Simulation")
+    st.write("Monte Carlo simulation of emission-factor uncertainty for each lifecycle stage.")
+    top_n_notice()
+
+    st.sidebar.header("Simulation Parameters")
+    n_draws = st.sidebar.select_slider("Number of Draws", options=[1_000, 10_000, 100_000, 1_000_000], value=10_000)
+    confidence = st.sidebar.slider("Confidence Level (%)", 50, 99, 90) / 100
+    uncertainty = {
+        column: st.sidebar.slider(f"{column.split(' (')[0]} Uncertainty (%)", 0, 100, int(default * 100)) / 100
+        for column, default in STAGE_UNCERTAINTY.items()
+    }
+    simulation_price = st.sidebar.slider("Carbon Price (€/ton)", 10, 100, 25, step=5)
+    seed = st.sidebar.number_input("Random Seed", min_value=0, value=0, step=1)
+
+    simulation = run_simulation(data, n_draws, confidence, uncertainty, simulation_price, seed)
+    low, median, high = simulation.footprint_interval()
+    cost_low, cost_median, cost_high = simulation.carbon_cost_interval()
+
+    col_footprint, col_cost = st.columns(2)
+    with col_footprint:
+        st.metric(label="Total Footprint, median (tons CO2)", value=f"{median / 1000:.2f}")
+        st.write(f"{confidence:.0%} interval: {low / 1000:.2f} – {high / 1000:.2f} tons")
+    with col_cost:
+        st.metric(label="Carbon Cost of Total Footprint, median (€)", value=f"€{cost_median:,.2f}")
+        st.write(f"{confidence:.0%} interval: €{cost_low:,.2f} – €{cost_high:,.2f}")
+        st.caption("Whole footprint at the simulated price; CBAM liability with phase-in and export share "
+                   "is under Environmental Analysis.")
+
+    # Distribution of the catalog total across draws
+    st.subheader("Total Footprint Distribution")
+    # Binned server-side so the chart payload does not grow with the number of draws
+    draw_counts, bin_edges = np.histogram(simulation.portfolio_draws / 1000, bins=60)
+    simulation_histogram = px.bar(
+        x=(bin_edges[:-1] + bin_edges[1:]) / 2,
+        y=draw_counts,
+        labels={"x": "Total Carbon Footprint (tons CO2)", "y": "Draws"},
+        color_discrete_sequence=px.colors.sequential.Blues[-3:]
+    )
+    simulation_histogram.update_layout(bargap=0)
+    show_chart(simulation_histogram, "simulation_histogram")
+
+    st.subheader("Per-Product Confidence Intervals")
+    show_dataframe(simulation.products, "simulation_products")
 
-# Audit Progress Tab with JSON storage
+# Audit Progress Tab backed by the SQLite audit store
 elif selected_tab == "Audit Progress":
     st.header("🔍 Audit Progress")
 
-    # Path to the audit data file
-    audit_file = "audit_data.json"
-
-    # Load existing audit data
-    if os.path.exists(audit_file):
-        with open(audit_file, "r") as f:
-            audit_data = json.load(f)
-    else:
-        audit_data = []
+    audit_store = get_audit_store()
 
     # Submit new data
     with st.form("submit_audit_form"):
@@ -256,30 +484,41 @@ elif selected_tab == "Audit Progress":
         submitted = st.form_submit_button("Submit")
 
         if submitted:
-            new_entry = {
-                "client_id": client_id,
-                "emissions": emissions,
-                "compliance_doc": compliance_doc,
-                "status": "Pending",
-                "timestamp": datetime.now().isoformat()
-            }
-            audit_data.append(new_entry)
-            with open(audit_file, "w") as f:
-                json.dump(audit_data, f, indent=4)
+            audit_store.submit(client_id, emissions, compliance_doc)
             st.success("Data submitted successfully!")
 
-    # Display audit data
+    # Summary metrics come from the store's maintained views, not a scan of the submissions
+    audit_summary = audit_store.summary()
+    total_submissions = audit_summary["total_submissions"]
+    approved_count = audit_summary["by_status"].get("Approved", 0)
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Submissions", f"{total_submissions:,}")
+    col2.metric("Approved", f"{approved_count:,}")
+    col3.metric("Pending", f"{total_submissions - approved_count:,}")
+    col4.metric("Emissions Submitted", f"{audit_summary['total_emissions']:,.1f} kg CO2")
+    if audit_summary["by_day"]:
+        submissions_by_day = pd.DataFrame({
+            "Day": list(audit_summary["by_day"]),
+            "Submissions": list(audit_summary["by_day"].values()),
+            "Emissions (kg CO2)": list(audit_summary["emissions_by_day"].values()),
+        })
+        show_chart(px.bar(submissions_by_day, x="Day", y="Submissions", hover_data=["Emissions (kg CO2)"],
+                          title="Submissions by Day"), "audit_by_day")
+
+    # Display audit data one page at a time
     st.subheader("Audit Submissions")
-    if audit_data:
-        df = pd.DataFrame(audit_data)
-        st.dataframe(df)
+    if total_submissions:
+        page_count = (total_submissions - 1) // AUDIT_PAGE_SIZE + 1
+        page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1)
+        audit_page = audit_store.page(offset=(page - 1) * AUDIT_PAGE_SIZE, limit=AUDIT_PAGE_SIZE)
+        st.caption(f"Showing page {page} of {page_count} ({total_submissions} submissions)")
+        df = pd.DataFrame(audit_page, columns=AUDIT_COLUMNS)
+        show_dataframe(df, "audit_page")
 
         # Approve submissions
-        selected_submission = st.selectbox("Select Submission to Approve", range(len(audit_data)))
+        selected_submission = st.selectbox("Select Submission to Approve", df["id"])
         if st.button("Approve Submission"):
-            audit_data[selected_submission]["status"] = "Approved"
-            with open(audit_file, "w") as f:
-                json.dump(audit_data, f, indent=4)
+            audit_store.approve(int(selected_submission))
             st.success("Submission approved successfully!")
     else:
         st.info("No audit submissions yet.")
@@ -288,3 +527,9 @@ elif selected_tab == "Audit Progress":
 st.write("---")
 st.write("**CLEAR v1.0**")
 st.write("The CLEAR tool created by Dr. Avi Luvchik @ All rights reserved.")
+
+if rerun_trace is not None:
+    if ADMIN_MODE:
+        metrics_panel(rerun_trace)
+    if METRICS_LOG:
+        metrics.write_json(METRICS_LOG, rerun_trace)
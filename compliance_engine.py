@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+
+from lca_schema import STATUS_COLUMN, TOTAL_COLUMN
+
+# Optional scoping columns of an uploaded rules CSV, most specific last
+RULE_SCOPES = ["Category", "Product Name"]
+DEFAULT_REGULATION = "Threshold"
+
+_STATUS_LABELS = ["Compliant", "Non-Compliant", "No Rule"]
+
+
+class ComplianceRules:
+    """Emission thresholds compiled from a rules table for vectorized evaluation.
+
+    Each rule row has a Threshold and may name a Regulation, a Category and a
+    Product Name. Within a regulation, a product-level rule overrides a
+    category-level rule, which overrides an unscoped one; duplicates at the same
+    level keep the strictest threshold.
+    """
+
+    def __init__(self, rules):
+        if "Threshold" not in rules.columns:
+            raise ValueError("Compliance rules need a 'Threshold' column.")
+        rules = rules.copy()
+        rules["Threshold"] = pd.to_numeric(rules["Threshold"], errors="raise")
+        if "Regulation" not in rules.columns:
+            rules["Regulation"] = DEFAULT_REGULATION
+        for scope in RULE_SCOPES:
+            if scope not in rules.columns:
+                rules[scope] = np.nan
+
+        self.regulations = list(dict.fromkeys(rules["Regulation"].astype(str)))
+        self._compiled = {}
+        for regulation in self.regulations:
+            subset = rules[rules["Regulation"].astype(str) == regulation]
+            unscoped = subset[subset[RULE_SCOPES].isna().all(axis=1)]
+            default = unscoped["Threshold"].min() if len(unscoped) else np.nan
+            levels = []
+            for i, scope in enumerate(RULE_SCOPES):
+                # A rule belongs to its most specific scope
+                more_specific = RULE_SCOPES[i + 1:]
+                scoped = subset[subset[scope].notna() & subset[more_specific].isna().all(axis=1)]
+                if len(scoped):
+                    levels.append((scope, scoped.groupby(scope)["Threshold"].min().to_dict()))
+            self._compiled[regulation] = (default, levels)
+
+    def thresholds(self, products, regulation, _keys=None):
+        """Applicable threshold per product for one regulation (NaN when none applies)."""
+        keys = _keys if _keys is not None else _scope_keys(products)
+        default, levels = self._compiled[regulation]
+        threshold = np.full(len(products), default, dtype=np.float64)
+        for scope, mapping in levels:
+            if scope not in keys:
+                continue
+            codes, uniques = keys[scope]
+            # Look thresholds up once per distinct key, then gather by code; -1 hits the NaN slot
+            table = np.append(pd.Series(uniques).map(mapping).to_numpy(dtype=np.float64, na_value=np.nan), np.nan)
+            scoped = table[codes]
+            threshold = np.where(np.isnan(scoped), threshold, scoped)
+        return threshold
+
+    def evaluate(self, products, value_column=TOTAL_COLUMN):
+        """Return per-regulation statuses and the overall Compliance Status for each product."""
+        values = products[value_column].to_numpy(dtype=np.float64)
+        columns = {}
+        any_failure = np.zeros(len(products), dtype=bool)
+        any_rule = np.zeros(len(products), dtype=bool)
+        keys = _scope_keys(products)
+
+        for regulation in self.regulations:
+            threshold = self.thresholds(products, regulation, keys)
+            covered = ~np.isnan(threshold)
+            failed = covered & (values > threshold)
+            any_failure |= failed
+            any_rule |= covered
+            if len(self.regulations) > 1:
+                columns[f"{regulation} Threshold"] = threshold
+                columns[f"{regulation} Status"] = _status(failed, covered)
+
+        columns[STATUS_COLUMN] = _status(any_failure, any_rule)
+        return pd.DataFrame(columns, index=products.index)
+
+
+def _scope_keys(products):
+    # Factorize each scope column once so every regulation reuses the codes
+    keys = {}
+    for scope in RULE_SCOPES:
+        if scope not in products.columns:
+            continue
+        column = products[scope]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            keys[scope] = (column.cat.codes.to_numpy(), column.cat.categories)
+        else:
+            keys[scope] = pd.factorize(column)
+    return keys
+
+
+def _status(failed, covered):
+    codes = np.where(covered, failed.astype(np.int8), 2).astype(np.int8)
+    return pd.Categorical.from_codes(codes, categories=_STATUS_LABELS)
+
+
+def compile_rules(rules):
+    """Compile an uploaded rules DataFrame into ComplianceRules."""
+    return ComplianceRules(rules)
@@ -0,0 +1,94 @@
+import json
+import math
+
+import pandas as pd
+import streamlit as st
+
+from instrumentation import REGISTRY, current_trace
+from table_query import DEFAULT_PAGE_SIZE, NAME_COLUMN, TOTAL_COLUMN, query_table
+
+
+def show_chart(figure, name):
+    """st.plotly_chart timed as a span; the figure's JSON size is recorded while tracing."""
+    if current_trace() is not None:
+        REGISTRY.observe_size("payload_bytes", figure, kind="chart", element=name)
+    with REGISTRY.span(f"plotly_chart:{name}"):
+        st.plotly_chart(figure, use_container_width=True)
+
+
+def show_dataframe(frame, name, **kwargs):
+    """st.dataframe timed as a span; the frame's size is recorded while tracing."""
+    if current_trace() is not None:
+        REGISTRY.observe_size("payload_bytes", frame, kind="dataframe", element=name)
+    with REGISTRY.span(f"dataframe:{name}"):
+        st.dataframe(frame, **kwargs)
+
+
+def metrics_panel(trace, registry=REGISTRY):
+    """Sidebar panel with this rerun's spans, cache counters and metric exports."""
+    with st.sidebar.expander("Performance", expanded=False):
+        st.caption(f"Rerun so far: {trace.total_seconds * 1000:,.1f} ms")
+        spans = pd.DataFrame(trace.spans)
+        if not spans.empty:
+            spans["ms"] = spans.pop("seconds") * 1000
+            st.dataframe(spans, hide_index=True)
+        counters = pd.DataFrame([
+            {"counter": counter["name"], **counter["labels"], "value": counter["value"]}
+            for counter in registry.snapshot()["counters"]
+        ])
+        if not counters.empty:
+            st.dataframe(counters, hide_index=True)
+        st.download_button("Prometheus metrics", registry.prometheus_text(), file_name="metrics.prom")
+        st.download_button("JSON snapshot", json.dumps(registry.snapshot(), default=str), file_name="metrics.json")
+
+
+def paged_table(frame, key, page_size=DEFAULT_PAGE_SIZE, value_column=TOTAL_COLUMN, height=None, index=None,
+                decorate_page=None):
+    """Render a searchable, sortable table that only sends the visible page to the browser.
+
+    `index` is an optional FootprintIndex over value_column for the range slider.
+    `decorate_page`, if given, adds derived columns to the visible rows only.
+    """
+    col_search, col_sort, col_order = st.columns([2, 2, 1])
+    with col_search:
+        search = st.text_input("Search product name", key=f"{key}_search")
+    with col_sort:
+        sort_by = st.selectbox("Sort by", [None, *frame.columns], key=f"{key}_sort",
+                               format_func=lambda column: "Original order" if column is None else column)
+    with col_order:
+        ascending = st.radio("Order", ["Ascending", "Descending"], key=f"{key}_order") == "Ascending"
+
+    value_range = None
+    if index is not None and len(index):
+        low, high = index.min, index.max
+    elif value_column in frame.columns and len(frame):
+        low, high = float(frame[value_column].min()), float(frame[value_column].max())
+    else:
+        low = high = None
+    if low is not None and low < high:
+        value_range = st.slider(f"{value_column} range", low, high, (low, high), key=f"{key}_range")
+
+    # The page is clamped after filtering, so narrowing a search never lands past the end
+    page = st.session_state.get(f"{key}_page", 1)
+    page_rows, total = query_table(frame, search=search, value_range=value_range, sort_by=sort_by,
+                                   ascending=ascending, page=page, page_size=page_size,
+                                   name_column=NAME_COLUMN, value_column=value_column, index=index)
+    page_count = max(1, math.ceil(total / page_size))
+    if page > page_count:
+        st.session_state[f"{key}_page"] = page = page_count
+        page_rows, _ = query_table(frame, search=search, value_range=value_range, sort_by=sort_by,
+                                   ascending=ascending, page=page, page_size=page_size,
+                                   name_column=NAME_COLUMN, value_column=value_column, index=index)
+
+    if decorate_page is not None:
+        page_rows = decorate_page(page_rows)
+    if height is None:
+        show_dataframe(page_rows, key)
+    else:
+        show_dataframe(page_rows, key, height=height)
+    col_page, col_caption = st.columns([1, 3])
+    with col_page:
+        st.number_input("Page", min_value=1, max_value=page_count, step=1, key=f"{key}_page")
+    with col_caption:
+        first = (page - 1) * page_size + 1 if total else 0
+        st.caption(f"Rows {first:,}–{min(page * page_size, total):,} of {total:,} matching ({len(frame):,} total)")
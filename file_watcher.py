@@ -0,0 +1,184 @@
+import json
+import os
+import queue
+import time
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # Polling fallback below
+    FileSystemEventHandler = object
+    Observer = None
+
+# Directories never descended into or reported
+EXCLUDED_DIRS = {".git", "__pycache__", ".catalog_cache", ".venv", "venv", "node_modules", ".mypy_cache", ".pytest_cache"}
+WATCHED_SUFFIXES = (".py",)
+STATE_FILE = ".auto_push_state.json"
+DEFAULT_DEBOUNCE = 1.0
+DEFAULT_POLL_INTERVAL = 2.0
+
+
+def scan_mtimes(root, suffixes=WATCHED_SUFFIXES, excluded_dirs=EXCLUDED_DIRS):
+    """{relative path: mtime_ns} for watched files, pruning excluded directories."""
+    mtimes = {}
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in excluded_dirs:
+                        stack.append(entry.path)
+                elif entry.name.endswith(suffixes):
+                    mtimes[os.path.relpath(entry.path, root)] = entry.stat().st_mtime_ns
+            except FileNotFoundError:
+                continue
+    return mtimes
+
+
+class _EventQueue(FileSystemEventHandler):
+    # Forwards watchdog events for watched files into a thread-safe queue
+    def __init__(self, root, watcher):
+        self.root = root
+        self.watcher = watcher
+        self.events = queue.Queue()
+
+    def on_any_event(self, event):
+        if event.is_directory:
+            return
+        for path in (event.src_path, getattr(event, "dest_path", "")):
+            if path:
+                relative = os.path.relpath(os.fsdecode(path), self.root)
+                if self.watcher.is_watched(relative):
+                    self.events.put(relative)
+
+
+class FileWatcher:
+    """Reports debounced batches of changed files under root.
+
+    Uses filesystem events (inotify, FSEvents, ...) when watchdog is installed and
+    falls back to a pruned polling scan otherwise. The mtimes of handled files are
+    kept in a state file, so a restart only reports files that changed since.
+    """
+
+    def __init__(self, root, state_path=None, suffixes=WATCHED_SUFFIXES, excluded_dirs=EXCLUDED_DIRS,
+                 debounce=DEFAULT_DEBOUNCE, poll_interval=DEFAULT_POLL_INTERVAL, use_events=True):
+        self.root = os.path.abspath(root)
+        self.state_path = state_path or os.path.join(self.root, STATE_FILE)
+        self.suffixes = tuple(suffixes)
+        self.excluded_dirs = set(excluded_dirs)
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_events = use_events and Observer is not None
+        self.state = self._load_state()
+
+    def _load_state(self):
+        try:
+            with open(self.state_path) as f:
+                return {path: int(mtime) for path, mtime in json.load(f).items()}
+        except (FileNotFoundError, ValueError, AttributeError):
+            return None
+
+    def _save_state(self):
+        tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.state, f, sort_keys=True)
+        os.replace(tmp_path, self.state_path)
+
+    def is_watched(self, relative):
+        parts = relative.split(os.sep)
+        return (
+            parts[0] != os.pardir
+            and relative.endswith(self.suffixes)
+            and not any(part in self.excluded_dirs for part in parts[:-1])
+        )
+
+    def _mtime(self, relative):
+        try:
+            return os.stat(os.path.join(self.root, relative)).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def pending(self):
+        """Files that differ from the saved state right now, as relative paths."""
+        current = scan_mtimes(self.root, self.suffixes, self.excluded_dirs)
+        if self.state is None:
+            # First run: everything present is the baseline, not a change
+            self.state = current
+            self._save_state()
+            return []
+        changed = {path for path, mtime in current.items() if self.state.get(path) != mtime}
+        changed.update(path for path in self.state if path not in current)
+        return sorted(changed)
+
+    def mark_handled(self, paths):
+        """Record the current mtimes of paths so they are not reported again."""
+        for path in paths:
+            mtime = self._mtime(path)
+            if mtime is None:
+                self.state.pop(path, None)
+            else:
+                self.state[path] = mtime
+        self._save_state()
+
+    def _settled(self, candidates):
+        # Candidates whose mtime still differs from the state once writes went quiet
+        return sorted(path for path in candidates if self._mtime(path) != self.state.get(path))
+
+    def changes(self):
+        """Yield sorted lists of changed relative paths, one per burst of writes.
+
+        Changes made while the watcher was stopped are yielded first. Call
+        mark_handled once a batch has been dealt with; unhandled paths are
+        reported again on the next burst that touches them or on restart.
+        """
+        startup = self.pending()
+        if startup:
+            yield startup
+        if self.use_events:
+            yield from self._event_changes()
+        else:
+            yield from self._polling_changes()
+
+    def _event_changes(self):
+        handler = _EventQueue(self.root, self)
+        observer = Observer()
+        observer.schedule(handler, self.root, recursive=True)
+        observer.start()
+        try:
+            candidates = set()
+            while True:
+                try:
+                    candidates.add(handler.events.get(timeout=None if not candidates else self.debounce))
+                except queue.Empty:
+                    # No event for a full debounce window: the burst is over
+                    batch = self._settled(candidates)
+                    candidates = set()
+                    if batch:
+                        yield batch
+        finally:
+            observer.stop()
+            observer.join()
+
+    def _polling_changes(self):
+        previous = scan_mtimes(self.root, self.suffixes, self.excluded_dirs)
+        candidates = set()
+        last_change = None
+        while True:
+            time.sleep(self.debounce if candidates else self.poll_interval)
+            current = scan_mtimes(self.root, self.suffixes, self.excluded_dirs)
+            changed = {path for path, mtime in current.items() if previous.get(path) != mtime}
+            changed.update(path for path in previous if path not in current)
+            previous = current
+            if changed:
+                candidates |= changed
+                last_change = time.monotonic()
+            elif candidates and time.monotonic() - last_change >= self.debounce:
+                batch = self._settled(candidates)
+                candidates = set()
+                if batch:
+                    yield batch
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from lca_schema import KG_PER_TON, NAME_COLUMN, TAX_COLUMN, TONS_COLUMN, TOTAL_COLUMN
+
+# Rates offered by the Financial Analysis slider (€/ton)
+TAX_RATES = np.arange(10, 101, 5)
+
+
+class TaxModel:
+    """Carbon tax for a product table, precomputed once per dataset.
+
+    Tax is linear in the rate, so per-product tonnage and its total are stored
+    once and any rate, or a whole curve of rates, is a scalar or vector product.
+    The input table is never modified.
+    """
+
+    def __init__(self, product_names, footprint_kg):
+        self.product_names = np.asarray(product_names)
+        self.tons = np.asarray(footprint_kg, dtype=np.float64) / KG_PER_TON
+        self.tons.setflags(write=False)
+        self.total_tons = float(self.tons.sum())
+
+    def total_tax(self, rate):
+        """Total tax at one rate, O(1)."""
+        return self.total_tons * rate
+
+    def product_tax(self, rate):
+        return self.tons * rate
+
+    def tax_curve(self, rates=TAX_RATES):
+        """Total tax for each rate."""
+        return np.asarray(rates, dtype=np.float64) * self.total_tons
+
+    def product_tax_curve(self, rates=TAX_RATES):
+        """(rates x products) tax matrix."""
+        return np.multiply.outer(np.asarray(rates, dtype=np.float64), self.tons)
+
+    def tons_frame(self):
+        """Rate-independent name and tonnage table; tax is tons times the rate."""
+        return pd.DataFrame({NAME_COLUMN: self.product_names, TONS_COLUMN: self.tons})
+
+    def frame(self, rate):
+        """Cost breakdown table at one rate."""
+        return pd.DataFrame({
+            NAME_COLUMN: self.product_names,
+            TONS_COLUMN: self.tons,
+            TAX_COLUMN: self.product_tax(rate),
+        })
+
+
+def build_tax_model(data):
+    return TaxModel(data[NAME_COLUMN].to_numpy(), data[TOTAL_COLUMN].to_numpy())
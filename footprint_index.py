@@ -0,0 +1,66 @@
+import numpy as np
+
+from lca_schema import TOTAL_COLUMN
+
+
+class FootprintIndex:
+    """Row positions sorted by footprint, for O(log n) range, top-k and percentile queries.
+
+    Build it once per dataset version and reuse it across reruns; NaN footprints
+    are left out of every query.
+    """
+
+    def __init__(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        order = np.argsort(values, kind="stable")
+        valid = np.count_nonzero(~np.isnan(values))
+        self.order = order[:valid]
+        self.sorted_values = values[self.order]
+
+    def __len__(self):
+        return len(self.order)
+
+    @property
+    def min(self):
+        return float(self.sorted_values[0])
+
+    @property
+    def max(self):
+        return float(self.sorted_values[-1])
+
+    def _bounds(self, low, high):
+        start = np.searchsorted(self.sorted_values, low, side="left")
+        stop = np.searchsorted(self.sorted_values, high, side="right")
+        return start, stop
+
+    def range_count(self, low, high):
+        start, stop = self._bounds(low, high)
+        return int(max(stop - start, 0))
+
+    def range_positions(self, low, high):
+        """Row positions with low <= footprint <= high, in footprint order."""
+        start, stop = self._bounds(low, high)
+        return self.order[start:stop]
+
+    def range_mask(self, low, high, size=None):
+        """Boolean mask over the original rows for a footprint range."""
+        mask = np.zeros(size if size is not None else len(self.order), dtype=bool)
+        mask[self.range_positions(low, high)] = True
+        return mask
+
+    def top_k(self, k, largest=True):
+        """Row positions of the k largest (or smallest) footprints, most extreme first."""
+        k = min(k, len(self.order))
+        return self.order[::-1][:k] if largest else self.order[:k]
+
+    def percentile(self, q):
+        """Footprint at percentile q (0-100), linearly interpolated like np.percentile."""
+        position = q / 100 * (len(self.sorted_values) - 1)
+        lower = int(np.floor(position))
+        upper = min(lower + 1, len(self.sorted_values) - 1)
+        fraction = position - lower
+        return float(self.sorted_values[lower] * (1 - fraction) + self.sorted_values[upper] * fraction)
+
+
+def build_footprint_index(frame, column=TOTAL_COLUMN):
+    return FootprintIndex(frame[column].to_numpy())
@@ -0,0 +1,121 @@
+import os
+import subprocess
+import threading
+
+# Backoff between failed pushes, doubling up to the cap
+PUSH_RETRY_INITIAL = 1.0
+PUSH_RETRY_MAX = 60.0
+
+
+def git(repo_path, *args):
+    return subprocess.run(["git", *args], cwd=repo_path, check=True, capture_output=True, text=True)
+
+
+def _null_separated(output):
+    # -z output keeps paths with spaces or unusual characters intact and unquoted
+    return [path for path in output.split("\0") if path]
+
+
+def commit_batch(repo_path, paths, message=None):
+    """Stage paths with one git add and make one commit listing them.
+
+    Paths are relative to repo_path. Deleted paths are staged as removals;
+    ones git never tracked are skipped. Returns False when nothing was staged.
+    """
+    paths = sorted(paths)
+    missing = [path for path in paths if not os.path.lexists(os.path.join(repo_path, path))]
+    if missing:
+        # git add fails on a pathspec that matches neither a file nor the index
+        tracked = set(_null_separated(git(repo_path, "ls-files", "-z", "--", *missing).stdout))
+        paths = [path for path in paths if path not in missing or path in tracked]
+    if not paths:
+        return False
+    git(repo_path, "add", "-A", "--", *paths)
+    staged = _null_separated(git(repo_path, "diff", "--cached", "--name-only", "-z", "--", *paths).stdout)
+    if not staged:
+        return False
+    subject = message or (f"Auto-commit for {staged[0]}" if len(staged) == 1 else f"Auto-commit for {len(staged)} files")
+    body = "\n".join(f"- {path}" for path in staged)
+    git(repo_path, "commit", "-m", subject, "-m", body, "--", *staged)
+    return True
+
+
+class PushQueue:
+    """Pushes in a background thread so committing never waits on the network.
+
+    Requests made while a push is running or backing off are coalesced: one
+    push sends every commit made so far. Failed pushes are retried with
+    exponential backoff until they succeed or the queue is stopped.
+    """
+
+    def __init__(self, repo_path, remote="origin", branch="main",
+                 retry_initial=PUSH_RETRY_INITIAL, retry_max=PUSH_RETRY_MAX, log=print):
+        self.repo_path = repo_path
+        self.remote = remote
+        self.branch = branch
+        self.retry_initial = retry_initial
+        self.retry_max = retry_max
+        self.log = log
+        self.pushes = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+        self._pending = False
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._thread = threading.Thread(target=self._run, name="git-push", daemon=True)
+        self._thread.start()
+
+    def request(self):
+        """Ask for a push of everything committed so far; returns immediately."""
+        with self._lock:
+            self._pending = True
+            self._idle.clear()
+            self._wake.set()
+
+    def wait_idle(self, timeout=None):
+        """Block until every requested push has gone through."""
+        return self._idle.wait(timeout)
+
+    def stop(self, timeout=None):
+        """Stop after one last attempt at any outstanding push."""
+        self._stopping.set()
+        self._wake.set()
+        self._thread.join(timeout)
+
+    def _push(self):
+        try:
+            git(self.repo_path, "push", self.remote, self.branch)
+            self.pushes += 1
+            return True
+        except subprocess.CalledProcessError as e:
+            self.failures += 1
+            self.log(f"Push failed: {e.stderr.strip() or e}")
+            return False
+
+    def _push_until_done(self):
+        delay = self.retry_initial
+        while not self._push():
+            if self._stopping.is_set():
+                self.log("Giving up on push; commits stay local until the next run.")
+                return
+            self.log(f"Retrying push in {delay:.0f}s.")
+            # Interrupted by stop(); requests made meanwhile ride along with the retry
+            self._stopping.wait(delay)
+            delay = min(delay * 2, self.retry_max)
+        self.log(f"Pushed to {self.remote}/{self.branch}.")
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            with self._lock:
+                self._wake.clear()
+                wanted, self._pending = self._pending, False
+            if wanted:
+                self._push_until_done()
+            with self._lock:
+                if not self._pending:
+                    self._idle.set()
+                    if self._stopping.is_set():
+                        return
@@ -0,0 +1,105 @@
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+# Crockford base32: sortable, case-insensitive and free of I, L, O and U
+_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_DECODE = {c: i for i, c in enumerate(_ALPHABET)}
+
+# 48-bit millisecond timestamp | 32-bit node | 16-bit sequence = 96 bits, 20 characters
+_TIME_BITS, _NODE_BITS, _SEQ_BITS = 48, 32, 16
+_ID_CHARS = 20
+_SEQ_MAX = (1 << _SEQ_BITS) - 1
+_NODE_MASK = (1 << _NODE_BITS) - 1
+_PID_BITS = 22  # Linux pid_max is at most 2**22
+
+
+_HOST_BITS = _NODE_BITS - _PID_BITS
+
+
+def _default_node():
+    # Live processes on a host never share a PID, so the low bits keep workers
+    # apart; the high bits keep hosts apart. They are random unless CBAM_NODE_ID
+    # (0 to 1023) pins this host's part, e.g. one value per machine.
+    host = os.environ.get("CBAM_NODE_ID")
+    if host is not None:
+        host = int(host)
+        if not 0 <= host < (1 << _HOST_BITS):
+            raise ValueError(f"CBAM_NODE_ID must be between 0 and {(1 << _HOST_BITS) - 1}, got {host}")
+    else:
+        host = int.from_bytes(os.urandom(2), "big") >> (16 - _HOST_BITS)
+    return (host << _PID_BITS) | (os.getpid() & ((1 << _PID_BITS) - 1))
+
+
+def _encode(value):
+    chars = []
+    for _ in range(_ID_CHARS):
+        chars.append(_ALPHABET[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+class SubmissionIdGenerator:
+    """Time-ordered, collision-free IDs of the form SUB-<20 base32 chars>.
+
+    Each ID packs the millisecond timestamp, a per-process node number and a
+    per-millisecond sequence. Generation is thread-safe, never goes backwards
+    when the clock does, and IDs compare in time order as plain strings.
+    """
+
+    def __init__(self, prefix="SUB-", node=None):
+        self.prefix = prefix
+        self.node = _default_node() if node is None else node & _NODE_MASK
+        self._lock = threading.Lock()
+        self._last_ms = 0
+        self._seq = 0
+
+    def _reset_after_fork(self):
+        # A forked worker must not reuse the parent's node
+        self._lock = threading.Lock()
+        self.node = _default_node()
+        self._last_ms = 0
+        self._seq = 0
+
+    def next_id(self):
+        with self._lock:
+            now_ms = time.time_ns() // 1_000_000
+            if now_ms > self._last_ms:
+                self._last_ms = now_ms
+                self._seq = 0
+            elif self._seq < _SEQ_MAX:
+                self._seq += 1
+            else:
+                # Sequence exhausted, or the clock stepped back: borrow the next millisecond
+                self._last_ms += 1
+                self._seq = 0
+            value = (self._last_ms << (_NODE_BITS + _SEQ_BITS)) | (self.node << _SEQ_BITS) | self._seq
+        return self.prefix + _encode(value)
+
+
+def decode_id(submission_id, prefix="SUB-"):
+    """Return (timestamp, node, sequence) packed into an ID."""
+    value = 0
+    for c in submission_id[len(prefix):].upper():
+        value = (value << 5) | _DECODE[c]
+    ms = value >> (_NODE_BITS + _SEQ_BITS)
+    node = (value >> _SEQ_BITS) & _NODE_MASK
+    seq = value & _SEQ_MAX
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc), node, seq
+
+
+def id_lower_bound(timestamp, prefix="SUB-"):
+    """Smallest ID that can be generated at or after a datetime, for range scans."""
+    ms = int(timestamp.timestamp() * 1000)
+    return prefix + _encode(ms << (_NODE_BITS + _SEQ_BITS))
+
+
+_default_generator = SubmissionIdGenerator()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_default_generator._reset_after_fork)
+
+
+def new_submission_id():
+    """Generate a submission ID from the process-wide generator."""
+    return _default_generator.next_id()
@@ -0,0 +1,105 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from lca_schema import NAME_COLUMN, REQUIRED_COLUMNS, STAGE_COLUMNS, TOTAL_COLUMN
+
+# Uploads above this size are streamed and reduced instead of loaded whole
+STREAMING_THRESHOLD_BYTES = 50 * 1024 * 1024
+DEFAULT_CHUNK_ROWS = 200_000
+DEFAULT_TOP_N = 1000
+
+
+class UploadSummary:
+    """Aggregates of a streamed product CSV, bounded in size by top_n."""
+
+    def __init__(self, top_n):
+        self.top_n = top_n
+        self.rows = 0
+        self.invalid_rows = 0
+        self.stage_totals = pd.Series(0.0, index=STAGE_COLUMNS)
+        self.total_emissions = 0.0
+        self.top_products = pd.DataFrame({
+            NAME_COLUMN: pd.Series(dtype=object),
+            **{column: pd.Series(dtype=np.float64) for column in [*STAGE_COLUMNS, TOTAL_COLUMN]},
+        })
+
+    def add_chunk(self, chunk):
+        self.rows += len(chunk)
+        self.stage_totals += chunk[STAGE_COLUMNS].sum()
+        self.total_emissions += float(chunk[TOTAL_COLUMN].sum())
+        # Only the running top-N survives each chunk, so memory stays bounded
+        leaders = chunk.nlargest(self.top_n, TOTAL_COLUMN)[self.top_products.columns]
+        candidates = pd.concat([self.top_products, leaders], ignore_index=True) if len(self.top_products) else leaders
+        self.top_products = candidates.nlargest(self.top_n, TOTAL_COLUMN).reset_index(drop=True)
+
+
+def _validate_header(columns):
+    missing = [column for column in REQUIRED_COLUMNS if column not in columns]
+    if missing:
+        raise ValueError(f"Missing expected columns: {missing}")
+
+
+def _clean_chunk(chunk):
+    """Coerce emission columns to numbers and drop rows that do not parse.
+
+    As in validate_products, the file's own total is kept when it has that
+    column and derived from the stages when it does not.
+    """
+    has_total = TOTAL_COLUMN in chunk.columns
+    numeric = [*STAGE_COLUMNS, TOTAL_COLUMN] if has_total else STAGE_COLUMNS
+    for column in numeric:
+        chunk[column] = pd.to_numeric(chunk[column], errors="coerce")
+    valid = chunk[numeric].notna().all(axis=1) & chunk[NAME_COLUMN].notna()
+    chunk = chunk.loc[valid]
+    if not has_total:
+        chunk = chunk.assign(**{TOTAL_COLUMN: chunk[STAGE_COLUMNS].sum(axis=1)})
+    return chunk, int((~valid).sum())
+
+
+def _stream_size(file):
+    try:
+        return os.fstat(file.fileno()).st_size
+    except (AttributeError, OSError, ValueError):
+        pass
+    position = file.tell()
+    size = file.seek(0, os.SEEK_END)
+    file.seek(position)
+    return size
+
+
+def ingest_csv(file, chunk_rows=DEFAULT_CHUNK_ROWS, top_n=DEFAULT_TOP_N, progress=None):
+    """Stream a product CSV in chunks and reduce it to an UploadSummary.
+
+    Totals follow the same rule as small uploads: the CSV's total column when
+    present, otherwise the sum of the stages. Rows whose emissions do not
+    parse are skipped and counted in invalid_rows.
+
+    `file` is a path or a binary file object (such as a Streamlit upload).
+    `progress`, if given, is called with the fraction of bytes read.
+    """
+    opened = isinstance(file, (str, os.PathLike))
+    handle = open(file, "rb") if opened else file
+    try:
+        size = _stream_size(handle) or 1
+        start = handle.tell()
+        summary = UploadSummary(top_n)
+        usecols = lambda column: column in REQUIRED_COLUMNS or column == TOTAL_COLUMN  # noqa: E731
+        reader = pd.read_csv(handle, chunksize=chunk_rows, usecols=usecols, dtype={NAME_COLUMN: str})
+        with reader:
+            for chunk in reader:
+                _validate_header(chunk.columns)
+                chunk, invalid = _clean_chunk(chunk)
+                summary.invalid_rows += invalid
+                summary.add_chunk(chunk)
+                if progress is not None:
+                    progress(min(1.0, (handle.tell() - start) / size))
+        if summary.rows == 0:
+            # An empty body still has to carry the expected header
+            handle.seek(start)
+            _validate_header(pd.read_csv(handle, nrows=0).columns)
+        return summary
+    finally:
+        if opened:
+            handle.close()
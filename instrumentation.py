@@ -0,0 +1,391 @@
+import bisect
+import contextvars
+import functools
+import json
+import math
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from contextlib import contextmanager
+
+# Latency buckets in seconds, from sub-millisecond cache hits to multi-second loads
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Payload buckets in bytes, 1 KiB to 256 MiB
+SIZE_BUCKETS = tuple(1024 * 4 ** i for i in range(10))
+
+_current_trace = contextvars.ContextVar("current_trace", default=None)
+
+
+def _label_key(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(key, extra=()):
+    pairs = [*key, *extra]
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+class Histogram:
+    """Cumulative bucket counts, sum and count of observed values."""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.sum += value
+        self.count += 1
+        i = bisect.bisect_left(self.buckets, value)
+        if i < len(self.buckets):
+            self.counts[i] += 1
+
+    def quantile(self, q):
+        """Upper bucket bound containing quantile q; inf when it lies above every bucket."""
+        if not self.count:
+            return math.nan
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return math.inf
+
+
+class Trace:
+    """Spans recorded while it is active, in completion order, for one rerun or request."""
+
+    def __init__(self, name):
+        self.name = name
+        self.started = time.time()
+        self.spans = []
+
+    def add(self, name, seconds, **labels):
+        self.spans.append({"span": name, "seconds": seconds, **labels})
+
+    @property
+    def total_seconds(self):
+        return time.time() - self.started
+
+
+class MetricsRegistry:
+    """Thread-safe counters, gauges and histograms keyed by name and labels.
+
+    Exported as Prometheus text or JSON. One registry is shared by everything in
+    a process; spans also land in the active Trace, if any.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._gauges = {}
+        self._histograms = {}
+        self._help = {}
+
+    def describe(self, name, help_text):
+        self._help[name] = help_text
+
+    def inc(self, name, value=1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name, value, **labels):
+        with self._lock:
+            self._gauges[(name, _label_key(labels))] = value
+
+    def observe(self, name, value, buckets=DEFAULT_BUCKETS, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def observe_size(self, name, payload, **labels):
+        """Record the size in bytes of a payload; returns the size."""
+        size = payload_size(payload)
+        self.observe(name, size, buckets=SIZE_BUCKETS, **labels)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add(name, None, bytes=size, **labels)
+        return size
+
+    @contextmanager
+    def span(self, name, **labels):
+        """Time a block into the span_seconds histogram and the active trace."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.observe("span_seconds", elapsed, span=name, **labels)
+            trace = _current_trace.get()
+            if trace is not None:
+                trace.add(name, elapsed, **labels)
+
+    def timed(self, name=None, **labels):
+        """Decorator form of span, named after the function by default."""
+        def decorate(fn):
+            span_name = name or fn.__qualname__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name, **labels):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def counter_value(self, name, **labels):
+        with self._lock:
+            return self._counters.get((name, _label_key(labels)), 0)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    def snapshot(self):
+        """Plain-dict copy of every metric, for JSON export and tables."""
+        with self._lock:
+            return {
+                "counters": [
+                    {"name": name, "labels": dict(key), "value": value}
+                    for (name, key), value in sorted(self._counters.items())
+                ],
+                "gauges": [
+                    {"name": name, "labels": dict(key), "value": value}
+                    for (name, key), value in sorted(self._gauges.items())
+                ],
+                "histograms": [
+                    {
+                        "name": name, "labels": dict(key), "count": h.count, "sum": h.sum,
+                        "p50": h.quantile(0.5), "p99": h.quantile(0.99),
+                        "buckets": dict(zip(map(str, h.buckets), h.counts)),
+                    }
+                    for (name, key), h in sorted(self._histograms.items())
+                ],
+            }
+
+    def prometheus_text(self, prefix=""):
+        """Render every metric in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for kind, metrics in (("counter", self._counters), ("gauge", self._gauges)):
+                for name in sorted({name for name, _ in metrics}):
+                    full = prefix + name
+                    if name in self._help:
+                        lines.append(f"# HELP {full} {self._help[name]}")
+                    lines.append(f"# TYPE {full} {kind}")
+                    for (metric, key), value in sorted(metrics.items()):
+                        if metric == name:
+                            lines.append(f"{full}{_format_labels(key)} {value}")
+            for name in sorted({name for name, _ in self._histograms}):
+                full = prefix + name
+                if name in self._help:
+                    lines.append(f"# HELP {full} {self._help[name]}")
+                lines.append(f"# TYPE {full} histogram")
+                for (metric, key), h in sorted(self._histograms.items()):
+                    if metric != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(h.buckets, h.counts):
+                        cumulative += count
+                        lines.append(f"{full}_bucket{_format_labels(key, [('le', repr(float(bound)))])} {cumulative}")
+                    lines.append(f"{full}_bucket{_format_labels(key, [('le', '+Inf')])} {h.count}")
+                    lines.append(f"{full}_sum{_format_labels(key)} {h.sum}")
+                    lines.append(f"{full}_count{_format_labels(key)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path, trace=None):
+        """Append one JSON line with a snapshot, and the trace's spans if given."""
+        record = {"time": time.time(), "metrics": self.snapshot()}
+        if trace is not None:
+            record["trace"] = {"name": trace.name, "started": trace.started, "spans": trace.spans}
+        with open(path, "a") as f:
+            f.write(json.dumps(record, default=str) + "\n")
+
+
+REGISTRY = MetricsRegistry()
+REGISTRY.describe("span_seconds", "Wall time of instrumented spans.")
+REGISTRY.describe("cache_requests_total", "Calls to instrumented caches by result.")
+REGISTRY.describe("payload_bytes", "Size of payloads sent to the browser or over the wire.")
+
+
+@contextmanager
+def trace(name):
+    """Collect the spans recorded inside the block into a new Trace."""
+    current = Trace(name)
+    token = _current_trace.set(current)
+    try:
+        yield current
+    finally:
+        _current_trace.reset(token)
+
+
+def start_trace(name):
+    """Make a new Trace current until the next start_trace; for scripts that cannot wrap a block."""
+    current = Trace(name)
+    _current_trace.set(current)
+    return current
+
+
+def current_trace():
+    return _current_trace.get()
+
+
+def payload_size(payload):
+    """Approximate serialized size in bytes of a frame, figure, string or bytes."""
+    if isinstance(payload, (bytes, bytearray)):
+        return len(payload)
+    if isinstance(payload, str):
+        return len(payload.encode())
+    if hasattr(payload, "memory_usage"):  # DataFrame
+        return int(payload.memory_usage(index=True, deep=True).sum())
+    if hasattr(payload, "to_json"):  # Plotly figure
+        return len(payload.to_json())
+    return len(json.dumps(payload, default=str))
+
+
+_cache_state = threading.local()
+
+
+def instrument_cache(cache, name=None, registry=REGISTRY):
+    """Wrap a caching decorator (st.cache_data, functools.lru_cache, ...) with hit/miss counters.
+
+    The function body only runs on a miss, so a call whose body did not run is a hit.
+    """
+    def decorate(fn):
+        cache_name = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def on_miss(*args, **kwargs):
+            _cache_state.missed = True
+            return fn(*args, **kwargs)
+
+        cached = cache(on_miss)
+
+        @functools.wraps(fn)
+        def call(*args, **kwargs):
+            # Nested instrumented caches restore the caller's flag when they return
+            outer = getattr(_cache_state, "missed", False)
+            _cache_state.missed = False
+            try:
+                with registry.span(f"cache:{cache_name}"):
+                    result = cached(*args, **kwargs)
+                missed = _cache_state.missed
+            finally:
+                _cache_state.missed = outer
+            registry.inc("cache_requests_total", cache=cache_name, result="miss" if missed else "hit")
+            return result
+
+        call.clear = getattr(cached, "clear", None)
+        return call
+    return decorate
+
+
+class TimedProxy:
+    """Forwards attribute access to target, timing every method call into a histogram.
+
+    Used to time a storage backend without touching it: each call is observed
+    as metric{op=method name}.
+    """
+
+    def __init__(self, target, metric, registry=REGISTRY):
+        self._target = target
+        self._metric = metric
+        self._registry = registry
+
+    def __getattr__(self, name):
+        attribute = getattr(self._target, name)
+        if not callable(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        def timed_call(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return attribute(*args, **kwargs)
+            finally:
+                self._registry.observe(self._metric, time.perf_counter() - start, op=name)
+        return timed_call
+
+
+class SlowRequestProfiler:
+    """Samples the stacks of requests running longer than threshold and writes them to disk.
+
+    A background thread wakes every interval seconds and records the current
+    stack of each thread whose request is past the threshold. When such a
+    request finishes, its samples are written to directory in collapsed-stack
+    format ("frame;frame;frame count" lines), which flame graph tools read.
+    """
+
+    def __init__(self, threshold, directory, interval=0.01, max_files=1000):
+        self.threshold = threshold
+        self.directory = directory
+        self.interval = interval
+        self.max_files = max_files
+        self.dumps = 0
+        self._lock = threading.Lock()
+        self._active = {}
+        os.makedirs(directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._sample, name="slow-request-profiler", daemon=True)
+        self._thread.start()
+
+    def begin(self):
+        """Start watching the calling thread's request."""
+        with self._lock:
+            self._active[threading.get_ident()] = (time.perf_counter(), Counter())
+
+    def end(self, name):
+        """Stop watching; returns the dump path if the request was slow and sampled."""
+        with self._lock:
+            entry = self._active.pop(threading.get_ident(), None)
+        if entry is None:
+            return None
+        started, samples = entry
+        with self._lock:
+            samples = Counter(samples)
+        elapsed = time.perf_counter() - started
+        if elapsed < self.threshold or not samples or self.dumps >= self.max_files:
+            return None
+        self.dumps += 1
+        safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in name)
+        path = os.path.join(self.directory, f"{time.strftime('%Y%m%dT%H%M%S')}-{safe_name}-{elapsed * 1000:.0f}ms.txt")
+        with open(path, "w") as f:
+            f.write(f"# {name} took {elapsed * 1000:.1f} ms, {sum(samples.values())} samples every {self.interval * 1000:g} ms\n")
+            for stack, count in samples.most_common():
+                f.write(f"{stack} {count}\n")
+        return path
+
+    def _sample(self):
+        while True:
+            time.sleep(self.interval)
+            now = time.perf_counter()
+            with self._lock:
+                slow = [(ident, samples) for ident, (started, samples) in self._active.items()
+                        if now - started >= self.threshold]
+            if not slow:
+                continue
+            frames = sys._current_frames()
+            stacks = []
+            for ident, samples in slow:
+                frame = frames.get(ident)
+                if frame is not None:
+                    stack = traceback.extract_stack(frame)
+                    stacks.append((samples, ";".join(
+                        f"{entry.name} ({os.path.basename(entry.filename)}:{entry.lineno})" for entry in stack
+                    )))
+            # Counted under the lock so end() never reads a counter mid-update
+            with self._lock:
+                for samples, stack in stacks:
+                    samples[stack] += 1
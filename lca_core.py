@@ -0,0 +1,137 @@
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from catalog_store import load_catalog
+from compliance_engine import ComplianceRules, compile_rules
+from financials import build_tax_model
+from footprint_index import build_footprint_index
+# Schema names are re-exported so callers only need this module
+from lca_schema import (  # noqa: F401
+    CATEGORY_COLUMN, KG_PER_TON, NAME_COLUMN, PRODUCT_SCHEMA, REQUIRED_COLUMNS, STAGE_COLUMNS,
+    STATUS_COLUMN, TAX_COLUMN, TONS_COLUMN, TOTAL_COLUMN, validate_products,
+)
+from scenario_engine import ENERGY_FACTORS, TRANSPORT_FACTORS, evaluate_scenarios
+
+# Catalogs kept by load_products and catalog_for, per process
+MAX_CATALOGS = 8
+
+
+def scenario_factors(transport_type, energy_source):
+    """Per-stage multipliers for one sidebar selection, in STAGE_COLUMNS order."""
+    try:
+        return np.array([1.0, ENERGY_FACTORS[energy_source], TRANSPORT_FACTORS[transport_type]])
+    except KeyError:
+        raise KeyError(f"Unknown scenario: {transport_type} / {energy_source}") from None
+
+
+def adjust(products, transport_type, energy_source):
+    """Copy of the product table with stages scaled for a scenario and the total recomputed."""
+    stages = products[STAGE_COLUMNS].to_numpy(dtype=np.float64) * scenario_factors(transport_type, energy_source)
+    return products.assign(
+        **{column: stages[:, i] for i, column in enumerate(STAGE_COLUMNS)},
+        **{TOTAL_COLUMN: stages.sum(axis=1)},
+    )
+
+
+def to_tons(footprint_kg):
+    return np.asarray(footprint_kg, dtype=np.float64) / KG_PER_TON
+
+
+def total_tons(products):
+    return float(products[TOTAL_COLUMN].to_numpy(dtype=np.float64).sum()) / KG_PER_TON
+
+
+def carbon_cost(footprint_kg, rate):
+    """Carbon tax or credit cost in € for kg CO2 at rate €/ton."""
+    return to_tons(footprint_kg) * rate
+
+
+def compliance_status(products, rules):
+    """Per-regulation and overall compliance columns; rules is a rules table or ComplianceRules."""
+    if not isinstance(rules, ComplianceRules):
+        rules = compile_rules(rules)
+    return rules.evaluate(products)
+
+
+class ProductCatalog:
+    """A validated product table and the models derived from it, each built once.
+
+    Derived values are shared by every caller holding the catalog, so frames it
+    returns must be treated as read-only.
+    """
+
+    def __init__(self, products, version=None):
+        self.products = validate_products(products)
+        self.version = version
+        self._derived = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.products)
+
+    def _cached(self, key, compute):
+        with self._lock:
+            if key not in self._derived:
+                self._derived[key] = compute()
+            return self._derived[key]
+
+    def scenarios(self):
+        """Every transport x energy scenario, computed in one broadcast."""
+        return self._cached("scenarios", lambda: evaluate_scenarios(self.products))
+
+    def adjusted(self, transport_type, energy_source):
+        return self._cached(
+            ("adjusted", transport_type, energy_source),
+            lambda: self.scenarios().frame(transport_type, energy_source),
+        )
+
+    def tax_model(self):
+        return self._cached("tax_model", lambda: build_tax_model(self.products))
+
+    def footprint_index(self, transport_type=None, energy_source=None):
+        """Sorted footprint index of the base table, or of one scenario."""
+        if transport_type is None:
+            return self._cached("footprint_index", lambda: build_footprint_index(self.products))
+        return self._cached(
+            ("footprint_index", transport_type, energy_source),
+            lambda: build_footprint_index(self.adjusted(transport_type, energy_source)),
+        )
+
+    def total_tons(self):
+        return self.tax_model().total_tons
+
+
+_catalogs = OrderedDict()
+_catalogs_lock = threading.Lock()
+
+
+def _remember(key, build):
+    with _catalogs_lock:
+        if key in _catalogs:
+            _catalogs.move_to_end(key)
+            return _catalogs[key]
+    catalog = build()
+    with _catalogs_lock:
+        catalog = _catalogs.setdefault(key, catalog)
+        while len(_catalogs) > MAX_CATALOGS:
+            _catalogs.popitem(last=False)
+    return catalog
+
+
+def load_products(path):
+    """ProductCatalog for a product CSV, reused until the file changes."""
+    stat = os.stat(path)
+    version = ("file", os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    return _remember(version, lambda: ProductCatalog(load_catalog(path), version=version))
+
+
+def catalog_for(products, version):
+    """ProductCatalog for an in-memory table; version must change whenever the table does.
+
+    Passing the version of a catalog from load_products returns that catalog.
+    """
+    return _remember(version, lambda: ProductCatalog(products, version=version))
+
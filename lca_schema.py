@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+# Column names shared by every product table, in dashboard order
+NAME_COLUMN = "Product Name"
+CATEGORY_COLUMN = "Category"
+STAGE_COLUMNS = ["Raw Material (kg CO2)", "Production (kg CO2)", "Logistics (kg CO2)"]
+TOTAL_COLUMN = "Total Carbon Footprint (kg CO2)"
+TONS_COLUMN = "Total Carbon Footprint (tons)"
+TAX_COLUMN = "Carbon Tax (€)"
+STATUS_COLUMN = "Compliance Status"
+
+KG_PER_TON = 1000
+
+# Product table schema: column -> dtype. The total is derived from the stages when absent.
+PRODUCT_SCHEMA = {
+    NAME_COLUMN: object,
+    **{column: np.float64 for column in STAGE_COLUMNS},
+    TOTAL_COLUMN: np.float64,
+}
+REQUIRED_COLUMNS = [NAME_COLUMN, *STAGE_COLUMNS]
+
+
+def validate_products(products, recompute_total=False):
+    """Check a product table against PRODUCT_SCHEMA.
+
+    Returns the table with float64 emission columns and a total column; the
+    input is returned as is when it already conforms, and never modified.
+    Raises ValueError for missing columns or non-numeric emissions.
+    """
+    missing = [column for column in REQUIRED_COLUMNS if column not in products.columns]
+    if missing:
+        raise ValueError(f"Missing expected columns: {missing}")
+
+    updates = {}
+    for column in STAGE_COLUMNS:
+        if products[column].dtype != np.float64:
+            try:
+                updates[column] = pd.to_numeric(products[column], errors="raise").astype(np.float64)
+            except (TypeError, ValueError):
+                raise ValueError(f"Column {column!r} must be numeric.") from None
+    if recompute_total or TOTAL_COLUMN not in products.columns:
+        stages = [updates.get(column, products[column]) for column in STAGE_COLUMNS]
+        updates[TOTAL_COLUMN] = sum(stages[1:], stages[0]).astype(np.float64)
+    elif products[TOTAL_COLUMN].dtype != np.float64:
+        updates[TOTAL_COLUMN] = products[TOTAL_COLUMN].astype(np.float64)
+    return products.assign(**updates) if updates else products
@@ -0,0 +1,114 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from lca_schema import KG_PER_TON, NAME_COLUMN, STAGE_COLUMNS
+
+# Default relative uncertainty (coefficient of variation) of each stage's emission factor
+STAGE_UNCERTAINTY = {
+    "Raw Material (kg CO2)": 0.10,
+    "Production (kg CO2)": 0.15,
+    "Logistics (kg CO2)": 0.25,
+}
+
+# Work above this many product x draw samples is spread over a process pool
+PARALLEL_THRESHOLD = 50_000_000
+# Samples held in memory per product chunk (float32)
+CHUNK_SAMPLES = 16_000_000
+
+_worker_factors = None
+
+
+def sample_factors(n_draws, uncertainty=None, seed=0):
+    """Draw (n_draws x stages) lognormal emission-factor multipliers with mean 1.
+
+    The same seed always yields the same draws, whatever the worker count.
+    """
+    uncertainty = uncertainty or STAGE_UNCERTAINTY
+    cv = np.array([uncertainty[column] for column in STAGE_COLUMNS], dtype=np.float64)
+    sigma = np.sqrt(np.log1p(cv ** 2))
+    rng = np.random.default_rng(seed)
+    return rng.lognormal(mean=-sigma ** 2 / 2, sigma=sigma, size=(n_draws, len(STAGE_COLUMNS)))
+
+
+def _product_stats(base, factors, quantiles):
+    # (products x draws) samples for one chunk, reduced to mean and quantiles
+    samples = base.astype(np.float32) @ factors.T.astype(np.float32)
+    stats = np.empty((len(base), 1 + len(quantiles)))
+    stats[:, 0] = samples.mean(axis=1, dtype=np.float64)
+    stats[:, 1:] = np.quantile(samples, quantiles, axis=1).T
+    return stats
+
+
+def _init_worker(n_draws, uncertainty, seed):
+    # Workers regenerate the shared draws from the seed instead of receiving them
+    global _worker_factors
+    _worker_factors = sample_factors(n_draws, uncertainty, seed)
+
+
+def _worker_stats(base, quantiles):
+    return _product_stats(base, _worker_factors, quantiles)
+
+
+class SimulationResult:
+    """Confidence intervals from a Monte Carlo run."""
+
+    def __init__(self, products, portfolio_draws, confidence, carbon_price):
+        self.products = products
+        self.portfolio_draws = portfolio_draws
+        self.confidence = confidence
+        self.carbon_price = carbon_price
+
+    def footprint_interval(self):
+        """(low, median, high) of the total catalog footprint in kg CO2."""
+        tail = (1 - self.confidence) / 2
+        return tuple(float(q) for q in np.quantile(self.portfolio_draws, [tail, 0.5, 1 - tail]))
+
+    def carbon_cost_interval(self):
+        """(low, median, high) cost in € of the whole footprint at the simulated carbon price.
+
+        This is not a CBAM liability, which only covers EU-bound volumes and the
+        phase-in share; see cbam_liability.
+        """
+        return tuple(value / KG_PER_TON * self.carbon_price for value in self.footprint_interval())
+
+
+def simulate(data, n_draws=100_000, confidence=0.90, uncertainty=None, carbon_price=25.0, seed=0, workers=None):
+    """Sample stage emission factors and return per-product and catalog-level intervals.
+
+    Each draw scales every product's stages by the same sampled factors, so
+    products stay correlated the way a shared emission-factor database makes
+    them. Per-product statistics are computed in chunks; large runs use a
+    process pool.
+    """
+    base = data[STAGE_COLUMNS].to_numpy(dtype=np.float64)
+    factors = sample_factors(n_draws, uncertainty, seed)
+    tail = (1 - confidence) / 2
+    quantiles = np.array([tail, 0.5, 1 - tail])
+
+    # The catalog total is linear in the factors, so it never needs per-product samples
+    portfolio_draws = factors @ base.sum(axis=0)
+
+    chunk = max(1, CHUNK_SAMPLES // n_draws)
+    chunks = [base[i:i + chunk] for i in range(0, len(base), chunk)]
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(chunks) > 1 and len(base) * n_draws > PARALLEL_THRESHOLD:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(n_draws, uncertainty, seed)
+        ) as pool:
+            stats = list(pool.map(_worker_stats, chunks, [quantiles] * len(chunks)))
+    else:
+        stats = [_product_stats(part, factors, quantiles) for part in chunks]
+    stats = np.vstack(stats) if stats else np.empty((0, 4))
+
+    percent = round(confidence * 100)
+    products = pd.DataFrame({
+        NAME_COLUMN: data[NAME_COLUMN].to_numpy(),
+        "Mean (kg CO2)": stats[:, 0],
+        f"P{(100 - percent) / 2:g} (kg CO2)": stats[:, 1],
+        "Median (kg CO2)": stats[:, 2],
+        f"P{100 - (100 - percent) / 2:g} (kg CO2)": stats[:, 3],
+    })
+    return SimulationResult(products, portfolio_draws, confidence, carbon_price)
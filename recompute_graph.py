@@ -0,0 +1,77 @@
+from collections import OrderedDict
+
+
+class ComputeGraph:
+    """Dependency graph of derived values with memoized, incremental recompute.
+
+    Inputs are set on every rerun with a hashable version (the value itself by
+    default). Each node declares the inputs or nodes it depends on; a node is
+    recomputed only when the version of something it depends on changed.
+    Results are kept in one LRU bounded by max_entries. With a metrics registry,
+    each recompute is timed as a span and hits/misses are counted per node.
+    """
+
+    def __init__(self, max_entries=16, metrics=None):
+        self.max_entries = max_entries
+        self.metrics = metrics
+        self._inputs = {}
+        self._nodes = {}
+        self._memo = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def add(self, name, deps, compute):
+        """Declare a node computed as compute(*values of deps)."""
+        if name in self._inputs or name in self._nodes:
+            raise ValueError(f"Duplicate graph name: {name}")
+        missing = [dep for dep in deps if dep not in self._inputs and dep not in self._nodes]
+        if missing:
+            raise ValueError(f"Node {name} depends on undeclared names: {missing}")
+        self._nodes[name] = (tuple(deps), compute)
+
+    def input(self, name, value=None, version=None):
+        """Declare an input, optionally with its first value."""
+        if name in self._nodes:
+            raise ValueError(f"Duplicate graph name: {name}")
+        self._inputs[name] = (value, value if version is None else version)
+
+    def set_input(self, name, value, version=None):
+        """Update an input; version must be hashable and change whenever value does."""
+        if name not in self._inputs:
+            raise KeyError(f"Unknown graph input: {name}")
+        self._inputs[name] = (value, value if version is None else version)
+
+    def version(self, name):
+        if name in self._inputs:
+            return (name, self._inputs[name][1])
+        deps, _ = self._nodes[name]
+        return (name, tuple(self.version(dep) for dep in deps))
+
+    def get(self, name):
+        """Return a node's value, recomputing it and its stale dependencies only."""
+        if name in self._inputs:
+            return self._inputs[name][0]
+        key = self.version(name)
+        if key in self._memo:
+            self._memo.move_to_end(key)
+            self.hits += 1
+            if self.metrics is not None:
+                self.metrics.inc("graph_requests_total", node=name, result="hit")
+            return self._memo[key]
+
+        deps, compute = self._nodes[name]
+        values = [self.get(dep) for dep in deps]
+        if self.metrics is not None:
+            self.metrics.inc("graph_requests_total", node=name, result="miss")
+            with self.metrics.span(f"graph:{name}"):
+                value = compute(*values)
+        else:
+            value = compute(*values)
+        self.misses += 1
+        self._memo[key] = value
+        while len(self._memo) > self.max_entries:
+            self._memo.popitem(last=False)
+        return value
+
+    def clear(self):
+        self._memo.clear()
@@ -0,0 +1,104 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from lca_schema import CATEGORY_COLUMN, NAME_COLUMN, TOTAL_COLUMN
+
+REGULATIONS_FILE = "regulations.json"
+
+# Column names used by the Regulatory Compliance tables
+REGULATION_COLUMNS = {
+    "name": "Regulation Name",
+    "region": "Region",
+    "exposure": "Exposure Level (1-10)",
+    "description": "Description",
+}
+
+
+def load_regulations(path=REGULATIONS_FILE):
+    """Read a versioned rules file; return (version, regulations DataFrame)."""
+    with open(path, "r") as f:
+        rules = json.load(f)
+    regulations = pd.DataFrame(rules["regulations"])
+    for column in ("categories", "min_emissions", "max_emissions"):
+        if column not in regulations.columns:
+            regulations[column] = None
+    return str(rules["version"]), regulations
+
+
+class RegulationIndex:
+    """Regulations compiled into lookup tables keyed by region, category and emission band.
+
+    Emission bands are the intervals between every distinct rule bound, so a
+    product's band comes from one binary search and its applicable regulations
+    from one row of the band x regulation table.
+    """
+
+    def __init__(self, regulations, version=None):
+        self.version = version
+        self.regulations = regulations.reset_index(drop=True)
+        self.names = self.regulations["name"].to_numpy()
+        self.regions = self.regulations["region"].to_numpy()
+        self.exposure = self.regulations["exposure"].to_numpy(dtype=np.int64)
+
+        lower = pd.to_numeric(self.regulations["min_emissions"]).fillna(-np.inf).to_numpy(dtype=np.float64)
+        upper = pd.to_numeric(self.regulations["max_emissions"]).fillna(np.inf).to_numpy(dtype=np.float64)
+        bounds = np.concatenate([lower, upper])
+        self.edges = np.unique(bounds[np.isfinite(bounds)])
+
+        # Band b covers [edges[b - 1], edges[b]); bands 0 and len(edges) are open-ended
+        band_lower = np.concatenate([[-np.inf], self.edges])
+        band_upper = np.concatenate([self.edges, [np.inf]])
+        self.band_table = (lower[np.newaxis, :] <= band_lower[:, np.newaxis]) & (
+            band_upper[:, np.newaxis] <= upper[np.newaxis, :]
+        )
+
+        self.category_sets = [
+            None if not categories else set(categories) for categories in self.regulations["categories"]
+        ]
+
+    def _category_table(self, products):
+        # (product categories + 1) x regulations; the last row is "no category"
+        if CATEGORY_COLUMN in products.columns:
+            codes, uniques = pd.factorize(products[CATEGORY_COLUMN])
+        else:
+            codes, uniques = np.full(len(products), -1), []
+        table = np.ones((len(uniques) + 1, len(self.names)), dtype=bool)
+        for r, categories in enumerate(self.category_sets):
+            if categories is not None:
+                table[:-1, r] = [category in categories for category in uniques]
+                table[-1, r] = False
+        return table[codes]
+
+    def applicable(self, products, regions=None, value_column=TOTAL_COLUMN):
+        """Return one row per (product, applicable regulation) with its exposure level."""
+        values = products[value_column].to_numpy(dtype=np.float64)
+        bands = np.searchsorted(self.edges, values, side="right")
+        mask = self.band_table[bands] & self._category_table(products)
+        if regions is not None:
+            mask &= np.isin(self.regions, list(regions))[np.newaxis, :]
+
+        product_pos, regulation_pos = np.nonzero(mask)
+        return pd.DataFrame({
+            NAME_COLUMN: products[NAME_COLUMN].to_numpy()[product_pos],
+            REGULATION_COLUMNS["name"]: self.names[regulation_pos],
+            REGULATION_COLUMNS["region"]: self.regions[regulation_pos],
+            REGULATION_COLUMNS["exposure"]: self.exposure[regulation_pos],
+        }, index=products.index[product_pos])
+
+    def exposure_summary(self, products, regions=None, value_column=TOTAL_COLUMN):
+        """Per product: number of applicable regulations and the highest exposure level."""
+        matches = self.applicable(products, regions, value_column)
+        grouped = matches.groupby(level=0)[REGULATION_COLUMNS["exposure"]]
+        summary = pd.DataFrame({
+            NAME_COLUMN: products[NAME_COLUMN],
+            "Applicable Regulations": grouped.size().reindex(products.index, fill_value=0),
+            "Max Exposure Level": grouped.max().reindex(products.index, fill_value=0),
+        })
+        return summary
+
+
+def build_regulation_index(path=REGULATIONS_FILE):
+    version, regulations = load_regulations(path)
+    return RegulationIndex(regulations, version)
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+# STAGE_COLUMNS is also the order of the stage axis of every result
+from lca_schema import NAME_COLUMN, STAGE_COLUMNS, TOTAL_COLUMN
+
+# Scenario multipliers offered in the dashboard sidebars
+TRANSPORT_FACTORS = {"Air": 1.5, "Road": 1.0, "Sea": 0.8}
+ENERGY_FACTORS = {"Renewable": 0.7, "Non-renewable": 1.2}
+
+
+class ScenarioGrid:
+    """Every transport x energy combination as a (scenarios x stages) factor matrix."""
+
+    def __init__(self, transport_factors=None, energy_factors=None):
+        transport_factors = transport_factors or TRANSPORT_FACTORS
+        energy_factors = energy_factors or ENERGY_FACTORS
+
+        self.keys = [(t, e) for t in transport_factors for e in energy_factors]
+        self.factors = np.ones((len(self.keys), len(STAGE_COLUMNS)))
+        for i, (transport_type, energy_source) in enumerate(self.keys):
+            self.factors[i, 1] = energy_factors[energy_source]
+            self.factors[i, 2] = transport_factors[transport_type]
+        self._positions = {key: i for i, key in enumerate(self.keys)}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def index(self, transport_type, energy_source):
+        """Return the scenario axis position for a sidebar selection."""
+        try:
+            return self._positions[(transport_type, energy_source)]
+        except KeyError:
+            raise KeyError(f"Unknown scenario: {transport_type} / {energy_source}") from None
+
+
+class ScenarioResult:
+    """Per-product stage emissions for every scenario of a grid."""
+
+    def __init__(self, grid, product_names, stages):
+        self.grid = grid
+        self.product_names = product_names
+        self.stages = stages  # (scenarios x products x stages)
+        self.totals = stages.sum(axis=2)  # (scenarios x products)
+
+    def stage_emissions(self, transport_type, energy_source):
+        """(products x stages) view of one scenario, no copy."""
+        return self.stages[self.grid.index(transport_type, energy_source)]
+
+    def total_emissions(self, transport_type, energy_source):
+        """Per-product totals of one scenario, no copy."""
+        return self.totals[self.grid.index(transport_type, energy_source)]
+
+    def frame(self, transport_type, energy_source):
+        """Build the adjusted emissions table shown by the dashboards."""
+        i = self.grid.index(transport_type, energy_source)
+        frame = pd.DataFrame(self.stages[i], columns=STAGE_COLUMNS)
+        frame.insert(0, NAME_COLUMN, self.product_names)
+        frame[TOTAL_COLUMN] = self.totals[i]
+        return frame
+
+
+def evaluate_scenarios(data, grid=None):
+    """Compute every scenario of the grid for the product table in one broadcast."""
+    if grid is None:
+        grid = ScenarioGrid()
+    base = data[STAGE_COLUMNS].to_numpy(dtype=np.float64)
+    stages = base[np.newaxis, :, :] * grid.factors[:, np.newaxis, :]
+    return ScenarioResult(grid, data[NAME_COLUMN].to_numpy(), stages)
@@ -0,0 +1,41 @@
+import argparse
+import os
+
+import uvicorn
+
+from submission_store import DEFAULT_STORE_URL
+
+
+def main():
+    """Run the CBAM audit API under uvicorn with several worker processes.
+
+    Workers share submissions through the SQLite store, so an in-memory store
+    is only allowed with a single worker. SIGTERM/SIGINT stop accepting new
+    connections and let in-flight requests finish before workers exit.
+    """
+    parser = argparse.ArgumentParser(description="Serve the CBAM audit API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5001)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--store", default=os.environ.get("CBAM_STORE", DEFAULT_STORE_URL))
+    parser.add_argument("--graceful-timeout", type=int, default=30,
+                        help="Seconds to wait for in-flight requests on shutdown")
+    args = parser.parse_args()
+
+    if args.store == "memory" and args.workers > 1:
+        parser.error("The memory store is per-process; use a sqlite:/// store with several workers.")
+
+    # Worker processes import cbam_audit themselves and open the store from the environment
+    os.environ["CBAM_STORE"] = args.store
+    uvicorn.run(
+        "cbam_asgi:asgi_app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        access_log=False,
+    )
+
+
+if __name__ == "__main__":
+    main()
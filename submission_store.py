@@ -0,0 +1,310 @@
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import Counter, defaultdict
+
+import summary_views
+
+DEFAULT_STORE_URL = "sqlite:///cbam_submissions.db"
+
+
+class DuplicateSubmissionError(ValueError):
+    """Raised when a submission ID is already stored."""
+
+
+class SubmissionStore(ABC):
+    """Storage interface behind the CBAM audit API.
+
+    Records are dicts with client_id, data, status and timestamp. Backends keep
+    secondary indexes by client and status and maintain summary views (counts by
+    status, client and day, and submitted emissions) on every write, so
+    summaries and per-client lookups never scan every submission.
+    """
+
+    @abstractmethod
+    def add(self, submission_id, record):
+        raise NotImplementedError
+
+    @abstractmethod
+    def add_many(self, items):
+        """Add (submission_id, record) pairs in one transaction; all or nothing."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get(self, submission_id):
+        """Return the record for an ID, or None."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_status(self, submission_id, status):
+        """Update a record's status; return False if the ID is unknown."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_status_many(self, submission_ids, status):
+        """Update several records in one transaction; return the set of IDs found."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def by_client(self, client_id):
+        """Return {submission_id: record} for one client."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def by_status(self, status):
+        """Return the submission IDs currently in a status."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def counts(self):
+        """Return {status: count} from the maintained counters."""
+        raise NotImplementedError
+
+    def total(self):
+        return sum(self.counts().values())
+
+    @abstractmethod
+    def summary(self):
+        """Return the maintained summary views, shaped like summary_views.make_summary."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def scan_summary(self):
+        """Recompute the summary from every stored record."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def rebuild_summary(self):
+        """Replace the maintained views with scan_summary() and return them."""
+        raise NotImplementedError
+
+    def verify_summary(self):
+        """Return {key: {"expected", "actual"}} for views that drifted from the records; empty when consistent."""
+        return summary_views.diff_summaries(self.scan_summary(), self.summary())
+
+
+def submitted_emissions(data):
+    """Numeric "emissions" field of a submission's data, or 0."""
+    value = data.get("emissions") if isinstance(data, dict) else None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return 0.0
+
+
+# The same rule in SQL, over the JSON-encoded data column
+_EMISSIONS_SQL = (
+    "CASE WHEN json_type({row}.data, '$.emissions') IN ('integer', 'real') "
+    "THEN json_extract({row}.data, '$.emissions') ELSE 0.0 END"
+)
+
+
+class MemorySubmissionStore(SubmissionStore):
+    """Process-local backend, mainly for tests and throwaway runs."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._records = {}
+        self._by_client = defaultdict(set)
+        self._by_status = defaultdict(set)
+        self._counts = Counter()
+        self._client_counts = Counter()
+        self._day_counts = Counter()
+        self._day_emissions = Counter()
+
+    def _add_to_views(self, record):
+        day = summary_views.record_day(record["timestamp"])
+        self._client_counts[record["client_id"]] += 1
+        self._day_counts[day] += 1
+        self._day_emissions[day] += submitted_emissions(record["data"])
+
+    def add(self, submission_id, record):
+        self.add_many([(submission_id, record)])
+
+    def add_many(self, items):
+        with self._lock:
+            ids = [submission_id for submission_id, _ in items]
+            for submission_id in ids:
+                if submission_id in self._records:
+                    raise DuplicateSubmissionError(submission_id)
+            if len(set(ids)) != len(ids):
+                raise DuplicateSubmissionError("duplicate IDs within batch")
+            for submission_id, record in items:
+                self._records[submission_id] = dict(record)
+                self._by_client[record["client_id"]].add(submission_id)
+                self._by_status[record["status"]].add(submission_id)
+                self._counts[record["status"]] += 1
+                self._add_to_views(record)
+
+    def get(self, submission_id):
+        record = self._records.get(submission_id)
+        return dict(record) if record is not None else None
+
+    def set_status(self, submission_id, status):
+        return submission_id in self.set_status_many([submission_id], status)
+
+    def set_status_many(self, submission_ids, status):
+        found = set()
+        with self._lock:
+            for submission_id in submission_ids:
+                record = self._records.get(submission_id)
+                if record is None:
+                    continue
+                found.add(submission_id)
+                old_status = record["status"]
+                if old_status != status:
+                    self._by_status[old_status].discard(submission_id)
+                    self._by_status[status].add(submission_id)
+                    self._counts[old_status] -= 1
+                    self._counts[status] += 1
+                    record["status"] = status
+        return found
+
+    def by_client(self, client_id):
+        with self._lock:
+            ids = sorted(self._by_client.get(client_id, ()))
+            return {sid: dict(self._records[sid]) for sid in ids}
+
+    def by_status(self, status):
+        with self._lock:
+            return sorted(self._by_status.get(status, ()))
+
+    def counts(self):
+        with self._lock:
+            return {status: count for status, count in self._counts.items() if count}
+
+    def summary(self):
+        with self._lock:
+            return summary_views.make_summary(
+                self._counts, self._client_counts, self._day_counts, self._day_emissions
+            )
+
+    def _rows(self):
+        return [
+            (record["client_id"], record["status"], record["timestamp"], submitted_emissions(record["data"]))
+            for record in self._records.values()
+        ]
+
+    def scan_summary(self):
+        with self._lock:
+            return summary_views.summarize(self._rows())
+
+    def rebuild_summary(self):
+        with self._lock:
+            self._counts = Counter()
+            self._client_counts = Counter()
+            self._day_counts = Counter()
+            self._day_emissions = Counter()
+            for record in self._records.values():
+                self._counts[record["status"]] += 1
+                self._add_to_views(record)
+        return self.summary()
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    id TEXT PRIMARY KEY,
+    client_id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    status TEXT NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS submissions_client ON submissions (client_id);
+CREATE INDEX IF NOT EXISTS submissions_status ON submissions (status);
+""" + summary_views.summary_schema(_EMISSIONS_SQL, ["data"])
+
+
+class SqliteSubmissionStore(SubmissionStore):
+    """Durable backend on a local SQLite database in WAL mode.
+
+    Summary views live in tables maintained by triggers, so they commit
+    atomically with the row they describe and are shared by every worker process.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(_SQLITE_SCHEMA)
+        summary_views.ensure_summary(self._connect(), _EMISSIONS_SQL)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _record(row):
+        client_id, data, status, timestamp = row
+        return {"client_id": client_id, "data": json.loads(data), "status": status, "timestamp": timestamp}
+
+    def add(self, submission_id, record):
+        self.add_many([(submission_id, record)])
+
+    def add_many(self, items):
+        rows = [
+            (submission_id, record["client_id"], json.dumps(record["data"]), record["status"], record["timestamp"])
+            for submission_id, record in items
+        ]
+        try:
+            with self._connect() as conn:
+                conn.executemany(
+                    "INSERT INTO submissions (id, client_id, data, status, timestamp) VALUES (?, ?, ?, ?, ?)", rows
+                )
+        except sqlite3.IntegrityError as e:
+            raise DuplicateSubmissionError(str(e)) from None
+
+    def get(self, submission_id):
+        row = self._connect().execute(
+            "SELECT client_id, data, status, timestamp FROM submissions WHERE id = ?", (submission_id,)
+        ).fetchone()
+        return self._record(row) if row is not None else None
+
+    def set_status(self, submission_id, status):
+        return submission_id in self.set_status_many([submission_id], status)
+
+    def set_status_many(self, submission_ids, status):
+        found = set()
+        with self._connect() as conn:
+            for submission_id in submission_ids:
+                cursor = conn.execute("UPDATE submissions SET status = ? WHERE id = ?", (status, submission_id))
+                if cursor.rowcount == 1:
+                    found.add(submission_id)
+        return found
+
+    def by_client(self, client_id):
+        rows = self._connect().execute(
+            "SELECT id, client_id, data, status, timestamp FROM submissions WHERE client_id = ? ORDER BY id",
+            (client_id,),
+        )
+        return {row[0]: self._record(row[1:]) for row in rows}
+
+    def by_status(self, status):
+        rows = self._connect().execute("SELECT id FROM submissions WHERE status = ? ORDER BY id", (status,))
+        return [row[0] for row in rows]
+
+    def counts(self):
+        rows = self._connect().execute("SELECT status, count FROM status_counts WHERE count > 0")
+        return dict(rows.fetchall())
+
+    def summary(self):
+        return summary_views.read_summary(self._connect())
+
+    def scan_summary(self):
+        return summary_views.scan_summary(self._connect(), _EMISSIONS_SQL)
+
+    def rebuild_summary(self):
+        return summary_views.rebuild_summary(self._connect(), _EMISSIONS_SQL)
+
+
+def open_store(url=DEFAULT_STORE_URL):
+    """Open a backend from a URL: "memory" or "sqlite:///<path>"."""
+    if url == "memory":
+        return MemorySubmissionStore()
+    if url.startswith("sqlite:///"):
+        return SqliteSubmissionStore(url[len("sqlite:///"):])
+    raise ValueError(f"Unsupported submission store URL: {url}")
@@ -0,0 +1,170 @@
+import math
+from collections import Counter
+
+# Materialized summary tables for a SQLite "submissions" table with client_id,
+# status and timestamp columns. Triggers keep them current on every insert,
+# update and delete, in the same transaction as the row, so every worker process
+# reads the same totals. Emissions come from a SQL expression over {row}, the
+# submission row alias; {emissions_columns} are the columns it reads.
+_SUMMARY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS status_counts (
+    status TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS client_counts (
+    client_id TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS day_counts (
+    day TEXT PRIMARY KEY,
+    count INTEGER NOT NULL,
+    emissions REAL NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS submissions_count_insert AFTER INSERT ON submissions
+BEGIN
+    INSERT INTO status_counts (status, count) VALUES (NEW.status, 1)
+    ON CONFLICT (status) DO UPDATE SET count = count + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS submissions_count_update AFTER UPDATE OF status ON submissions
+WHEN OLD.status != NEW.status
+BEGIN
+    UPDATE status_counts SET count = count - 1 WHERE status = OLD.status;
+    INSERT INTO status_counts (status, count) VALUES (NEW.status, 1)
+    ON CONFLICT (status) DO UPDATE SET count = count + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS submissions_count_delete AFTER DELETE ON submissions
+BEGIN
+    UPDATE status_counts SET count = count - 1 WHERE status = OLD.status;
+END;
+CREATE TRIGGER IF NOT EXISTS submissions_summary_insert AFTER INSERT ON submissions
+BEGIN
+{add_new}
+END;
+CREATE TRIGGER IF NOT EXISTS submissions_summary_update AFTER UPDATE OF client_id, timestamp, {emissions_columns}
+ON submissions
+BEGIN
+{remove_old}
+{add_new}
+END;
+CREATE TRIGGER IF NOT EXISTS submissions_summary_delete AFTER DELETE ON submissions
+BEGIN
+{remove_old}
+END;
+"""
+
+_ADD_ROW = """    INSERT INTO client_counts (client_id, count) VALUES (NEW.client_id, 1)
+    ON CONFLICT (client_id) DO UPDATE SET count = count + 1;
+    INSERT INTO day_counts (day, count, emissions) VALUES (substr(NEW.timestamp, 1, 10), 1, {emissions})
+    ON CONFLICT (day) DO UPDATE SET count = count + 1, emissions = emissions + excluded.emissions;"""
+
+# Groups that reach zero are dropped, so removed clients and days leave no rows behind
+_REMOVE_ROW = """    UPDATE client_counts SET count = count - 1 WHERE client_id = OLD.client_id;
+    DELETE FROM client_counts WHERE client_id = OLD.client_id AND count <= 0;
+    UPDATE day_counts SET count = count - 1, emissions = emissions - ({emissions})
+    WHERE day = substr(OLD.timestamp, 1, 10);
+    DELETE FROM day_counts WHERE day = substr(OLD.timestamp, 1, 10) AND count <= 0;"""
+
+
+def summary_schema(emissions_sql, emissions_columns):
+    return _SUMMARY_SCHEMA.format(
+        add_new=_ADD_ROW.format(emissions=emissions_sql.format(row="NEW")),
+        remove_old=_REMOVE_ROW.format(emissions=emissions_sql.format(row="OLD")),
+        emissions_columns=", ".join(emissions_columns),
+    )
+
+
+def make_summary(by_status, by_client, by_day, emissions_by_day):
+    """The summary dict every store returns, with empty groups dropped."""
+    by_status = {status: int(count) for status, count in sorted(by_status.items()) if count}
+    emissions_by_day = {day: float(emissions_by_day.get(day, 0.0)) for day in sorted(by_day) if by_day[day]}
+    return {
+        "total_submissions": sum(by_status.values()),
+        "by_status": by_status,
+        "by_client": {client: int(count) for client, count in sorted(by_client.items()) if count},
+        "by_day": {day: int(count) for day, count in sorted(by_day.items()) if count},
+        "emissions_by_day": emissions_by_day,
+        "total_emissions": sum(emissions_by_day.values(), 0.0),
+    }
+
+
+def record_day(timestamp):
+    # ISO timestamps start with the date
+    return str(timestamp)[:10]
+
+
+def summarize(rows):
+    """Summary from (client_id, status, timestamp, emissions) tuples, by scanning them all."""
+    by_status, by_client, by_day, emissions_by_day = Counter(), Counter(), Counter(), Counter()
+    for client_id, status, timestamp, emissions in rows:
+        day = record_day(timestamp)
+        by_status[status] += 1
+        by_client[client_id] += 1
+        by_day[day] += 1
+        emissions_by_day[day] += emissions
+    return make_summary(by_status, by_client, by_day, emissions_by_day)
+
+
+def read_summary(conn):
+    """Summary from the materialized tables; cost depends on the number of groups, not rows."""
+    days = conn.execute("SELECT day, count, emissions FROM day_counts").fetchall()
+    return make_summary(
+        dict(conn.execute("SELECT status, count FROM status_counts").fetchall()),
+        dict(conn.execute("SELECT client_id, count FROM client_counts").fetchall()),
+        {day: count for day, count, _ in days},
+        {day: emissions for day, _, emissions in days},
+    )
+
+
+def _group_queries(emissions_sql):
+    return {
+        "status_counts": "SELECT status, COUNT(*) FROM submissions GROUP BY status",
+        "client_counts": "SELECT client_id, COUNT(*) FROM submissions GROUP BY client_id",
+        "day_counts": (
+            f"SELECT substr(timestamp, 1, 10), COUNT(*), TOTAL({emissions_sql.format(row='submissions')}) "
+            "FROM submissions GROUP BY 1"
+        ),
+    }
+
+
+def scan_summary(conn, emissions_sql):
+    """Summary recomputed from the raw submissions, without touching the tables."""
+    queries = _group_queries(emissions_sql)
+    days = conn.execute(queries["day_counts"]).fetchall()
+    return make_summary(
+        dict(conn.execute(queries["status_counts"]).fetchall()),
+        dict(conn.execute(queries["client_counts"]).fetchall()),
+        {day: count for day, count, _ in days},
+        {day: emissions for day, _, emissions in days},
+    )
+
+
+def rebuild_summary(conn, emissions_sql):
+    """Replace the materialized tables with counts from the raw submissions, in one transaction."""
+    with conn:
+        for table, query in _group_queries(emissions_sql).items():
+            conn.execute(f"DELETE FROM {table}")
+            conn.execute(f"INSERT INTO {table} {query}")
+    return read_summary(conn)
+
+
+def ensure_summary(conn, emissions_sql):
+    """Backfill the tables for databases written before they existed."""
+    materialized = conn.execute("SELECT COALESCE(SUM(count), 0) FROM client_counts").fetchone()[0]
+    if materialized != conn.execute("SELECT COUNT(*) FROM submissions").fetchone()[0]:
+        rebuild_summary(conn, emissions_sql)
+
+
+def diff_summaries(expected, actual):
+    """Keys whose values differ between two summaries; emissions compare with a float tolerance."""
+    differences = {}
+    for key in expected:
+        left, right = expected[key], actual.get(key)
+        if key == "emissions_by_day" and right is not None and left.keys() == right.keys():
+            same = all(math.isclose(left[day], right[day], rel_tol=1e-9, abs_tol=1e-6) for day in left)
+        elif key == "total_emissions" and right is not None:
+            same = math.isclose(left, right, rel_tol=1e-9, abs_tol=1e-6)
+        else:
+            same = left == right
+        if not same:
+            differences[key] = {"expected": left, "actual": right}
+    return differences
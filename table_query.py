@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+from lca_schema import NAME_COLUMN, TOTAL_COLUMN
+
+DEFAULT_PAGE_SIZE = 50
+
+
+def name_mask(names, query):
+    """Case-insensitive substring match; categorical names are matched once per category."""
+    if isinstance(names.dtype, pd.CategoricalDtype):
+        hits = names.cat.categories.astype(str).str.contains(query, case=False, regex=False)
+        return np.append(np.asarray(hits), False)[names.cat.codes.to_numpy()]
+    return names.astype(str).str.contains(query, case=False, regex=False).to_numpy()
+
+
+def _ordered_positions(values, positions, ascending, stop):
+    # Only the first `stop` rows of the sort order are needed for the requested page
+    keys = values[positions] if ascending else -values[positions]
+    if stop < len(positions) // 4:
+        head = np.argpartition(keys, stop - 1)[:stop]
+        return positions[head[np.argsort(keys[head], kind="stable")]]
+    return positions[np.argsort(keys, kind="stable")][:stop]
+
+
+def query_table(frame, search=None, value_range=None, sort_by=None, ascending=True,
+                page=1, page_size=DEFAULT_PAGE_SIZE, name_column=NAME_COLUMN, value_column=TOTAL_COLUMN,
+                index=None):
+    """Filter, sort and page a table server-side.
+
+    Returns (rows of the requested page, number of matching rows). Only the
+    page is materialized; filtering works on masks and sorting only orders as
+    many rows as the page needs. A FootprintIndex over value_column, if given,
+    answers the range filter by binary search instead of a full scan, and
+    an unfiltered page in original or value order is sliced without any scan.
+    """
+    start = (max(page, 1) - 1) * page_size
+    if index is not None and value_range is not None and len(index) == len(frame) and (
+            value_range[0] <= index.min and value_range[1] >= index.max):
+        value_range = None  # The full range filters nothing
+    if not search and value_range is None:
+        if sort_by is None:
+            return frame.iloc[start:start + page_size], len(frame)
+        if index is not None and sort_by == value_column and len(index) == len(frame):
+            order = index.order if ascending else index.order[::-1]
+            return frame.iloc[order[start:start + page_size]], len(frame)
+
+    mask = np.ones(len(frame), dtype=bool)
+    if search:
+        mask &= name_mask(frame[name_column], search)
+    if value_range is not None and index is not None:
+        mask &= index.range_mask(value_range[0], value_range[1], len(frame))
+    elif value_range is not None:
+        values = frame[value_column].to_numpy()
+        mask &= (values >= value_range[0]) & (values <= value_range[1])
+    positions = np.flatnonzero(mask)
+    total = len(positions)
+
+    stop = min(start + page_size, total)
+    if start >= total:
+        return frame.iloc[:0], total
+    if sort_by is not None:
+        sort_values = frame[sort_by]
+        if pd.api.types.is_numeric_dtype(sort_values):
+            positions = _ordered_positions(sort_values.to_numpy(dtype=np.float64), positions, ascending, stop)
+        else:
+            order = sort_values.iloc[positions].astype(str).argsort(kind="stable").to_numpy()
+            positions = positions[order if ascending else order[::-1]]
+    return frame.iloc[positions[start:stop]], total
@@ -0,0 +1,44 @@
+import os
+
+import pytest
+
+# The API must never write to the real submission database under test
+os.environ["CBAM_STORE"] = "memory"
+
+from cbam_audit import app  # noqa: E402
+
+PRODUCT = {
+    "Product Name": "Sano Test",
+    "Raw Material (kg CO2)": 10.0,
+    "Production (kg CO2)": 20.0,
+    "Logistics (kg CO2)": 30.0,
+}
+
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+
+def test_calculate_footprint_applies_scenario_and_tax(client):
+    response = client.post("/calculate_footprint", json={
+        "products": [PRODUCT], "transport_type": "Road", "energy_source": "Renewable", "carbon_tax_rate": 50,
+    })
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["products"][0]["product_name"] == "Sano Test"
+    assert body["total_carbon_tax"] == pytest.approx(body["total_footprint_kg"] / 1000 * 50)
+
+
+@pytest.mark.parametrize("payload", [[PRODUCT], "products", 5, True])
+def test_calculate_footprint_rejects_non_object_json(client, payload):
+    response = client.post("/calculate_footprint", json=payload)
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+
+def test_calculate_footprint_rejects_bad_products(client):
+    assert client.post("/calculate_footprint", json={"products": [{"Product Name": "x"}]}).status_code == 400
+    assert client.post("/calculate_footprint", json={
+        "products": [PRODUCT], "transport_type": "Rocket",
+    }).status_code == 400
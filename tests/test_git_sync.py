@@ -0,0 +1,89 @@
+import subprocess
+
+import pytest
+
+from git_sync import PushQueue, commit_batch, git
+
+
+@pytest.fixture
+def repos(tmp_path):
+    """A working repository with one commit and a local bare remote."""
+    remote = tmp_path / "remote.git"
+    work = tmp_path / "work"
+    subprocess.run(["git", "init", "-q", "--bare", "-b", "main", str(remote)], check=True)
+    subprocess.run(["git", "init", "-q", "-b", "main", str(work)], check=True)
+    git(work, "config", "user.email", "sync@example.com")
+    git(work, "config", "user.name", "Sync Test")
+    for name in ("a.py", "b.py"):
+        (work / name).write_text("0\n")
+    git(work, "add", ".")
+    git(work, "commit", "-q", "-m", "Initial commit")
+    git(work, "remote", "add", "origin", str(remote))
+    return work, remote
+
+
+def test_commit_batch_makes_one_commit_listing_the_files(repos):
+    work, _ = repos
+    (work / "a.py").write_text("1\n")
+    (work / "c.py").write_text("new\n")
+    (work / "b.py").unlink()
+
+    assert commit_batch(work, ["c.py", "a.py", "b.py"])
+    assert git(work, "rev-list", "--count", "HEAD").stdout.strip() == "2"
+    message = git(work, "log", "-1", "--format=%s%n%b").stdout
+    assert message.startswith("Auto-commit for 3 files")
+    assert all(f"- {name}" in message for name in ("a.py", "b.py", "c.py"))
+    assert git(work, "status", "--porcelain").stdout == ""
+
+
+def test_commit_batch_skips_untracked_deleted_paths(repos):
+    work, _ = repos
+    (work / "a.py").write_text("1\n")
+
+    assert commit_batch(work, ["a.py", "never_tracked.py"])
+    assert git(work, "log", "-1", "--format=%s").stdout.strip() == "Auto-commit for a.py"
+    assert not commit_batch(work, ["never_tracked.py"])
+    assert not commit_batch(work, ["a.py"])
+
+
+def test_push_queue_pushes_to_bare_remote(repos):
+    work, remote = repos
+    queue = PushQueue(work, retry_initial=0.05, log=lambda message: None)
+    try:
+        (work / "a.py").write_text("1\n")
+        commit_batch(work, ["a.py"])
+        queue.request()
+        assert queue.wait_idle(timeout=30)
+    finally:
+        queue.stop(timeout=30)
+
+    assert git(remote, "rev-parse", "main").stdout == git(work, "rev-parse", "HEAD").stdout
+    assert queue.pushes == 1
+
+
+def test_push_queue_retries_until_remote_is_reachable(repos, tmp_path):
+    work, remote = repos
+    git(work, "remote", "set-url", "origin", str(tmp_path / "missing.git"))
+    queue = PushQueue(work, retry_initial=0.05, retry_max=0.1, log=lambda message: None)
+    try:
+        queue.request()
+        assert not queue.wait_idle(timeout=0.5)
+        git(work, "remote", "set-url", "origin", str(remote))
+        assert queue.wait_idle(timeout=30)
+    finally:
+        queue.stop(timeout=30)
+
+    assert queue.failures >= 1
+    assert git(remote, "rev-parse", "main").stdout == git(work, "rev-parse", "HEAD").stdout
+
+
+def test_commit_batch_handles_paths_with_spaces(repos):
+    work, _ = repos
+    (work / "import Sano as st.py").write_text("0\n")
+    assert commit_batch(work, ["import Sano as st.py"])
+    (work / "import Sano as st.py").write_text("1\n")
+    (work / "a.py").write_text("1\n")
+
+    assert commit_batch(work, ["import Sano as st.py", "a.py"])
+    assert "- import Sano as st.py" in git(work, "log", "-1", "--format=%b").stdout
+    assert git(work, "status", "--porcelain").stdout == ""
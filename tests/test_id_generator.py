@@ -0,0 +1,25 @@
+import os
+
+import pytest
+
+from id_generator import _PID_BITS, SubmissionIdGenerator, decode_id
+
+
+def test_ids_are_unique_and_time_ordered():
+    generator = SubmissionIdGenerator()
+    ids = [generator.next_id() for _ in range(10_000)]
+    assert len(set(ids)) == len(ids)
+    assert ids == sorted(ids)
+
+
+def test_configured_node_keeps_the_process_bits(monkeypatch):
+    monkeypatch.setenv("CBAM_NODE_ID", "5")
+    _, node, _ = decode_id(SubmissionIdGenerator().next_id())
+    assert node >> _PID_BITS == 5
+    assert node & ((1 << _PID_BITS) - 1) == os.getpid() & ((1 << _PID_BITS) - 1)
+
+
+def test_configured_node_out_of_range_is_rejected(monkeypatch):
+    monkeypatch.setenv("CBAM_NODE_ID", "1024")
+    with pytest.raises(ValueError):
+        SubmissionIdGenerator()
@@ -0,0 +1,89 @@
+import pytest
+
+from submission_store import (
+    DuplicateSubmissionError, MemorySubmissionStore, SqliteSubmissionStore, SubmissionStore, open_store,
+)
+
+
+def record(client_id="C1", status="Pending", emissions=1.5, timestamp="2026-10-17T12:00:00"):
+    return {"client_id": client_id, "data": {"emissions": emissions}, "status": status, "timestamp": timestamp}
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return open_store("memory")
+    return open_store(f"sqlite:///{tmp_path / 'submissions.db'}")
+
+
+def test_incomplete_backend_cannot_be_instantiated():
+    class Partial(SubmissionStore):
+        def add(self, submission_id, record):
+            pass
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_open_store_urls(tmp_path):
+    assert isinstance(open_store("memory"), MemorySubmissionStore)
+    assert isinstance(open_store(f"sqlite:///{tmp_path / 's.db'}"), SqliteSubmissionStore)
+    with pytest.raises(ValueError):
+        open_store("postgres://nowhere")
+
+
+def test_add_and_get_round_trip(store):
+    store.add("S1", record())
+    assert store.get("S1") == record()
+    assert store.get("missing") is None
+
+
+def test_duplicate_ids_are_rejected_atomically(store):
+    store.add("S1", record())
+    with pytest.raises(DuplicateSubmissionError):
+        store.add("S1", record())
+    with pytest.raises(DuplicateSubmissionError):
+        store.add_many([("S2", record()), ("S1", record())])
+    with pytest.raises(DuplicateSubmissionError):
+        store.add_many([("S3", record()), ("S3", record())])
+    assert store.get("S2") is None
+    assert store.get("S3") is None
+    assert store.total() == 1
+
+
+def test_status_updates_move_indexes_and_counts(store):
+    store.add_many([("S1", record()), ("S2", record()), ("S3", record(client_id="C2"))])
+    assert store.set_status("S1", "Approved")
+    assert not store.set_status("missing", "Approved")
+    assert store.set_status_many(["S2", "S3", "missing"], "Approved") == {"S2", "S3"}
+    assert store.set_status_many(["S1"], "Approved") == {"S1"}
+
+    assert store.counts() == {"Approved": 3}
+    assert store.by_status("Approved") == ["S1", "S2", "S3"]
+    assert store.by_status("Pending") == []
+    assert store.get("S1")["status"] == "Approved"
+
+
+def test_by_client_returns_only_that_client(store):
+    store.add_many([("S1", record()), ("S2", record(client_id="C2")), ("S3", record())])
+    assert list(store.by_client("C1")) == ["S1", "S3"]
+    assert store.by_client("nobody") == {}
+
+
+def test_summary_matches_a_scan_and_a_rebuild(store):
+    store.add_many([
+        ("S1", record(emissions=2.0, timestamp="2026-10-16T09:00:00")),
+        ("S2", record(client_id="C2", emissions=3)),
+        ("S3", {**record(), "data": {"emissions": "n/a"}}),
+        ("S4", {**record(), "data": {"emissions": True}}),
+    ])
+    store.set_status("S2", "Approved")
+
+    summary = store.summary()
+    assert summary["total_submissions"] == 4
+    assert summary["by_status"] == {"Approved": 1, "Pending": 3}
+    assert summary["by_client"] == {"C1": 3, "C2": 1}
+    assert summary["by_day"] == {"2026-10-16": 1, "2026-10-17": 3}
+    assert summary["total_emissions"] == pytest.approx(5.0)
+    assert store.verify_summary() == {}
+    assert store.rebuild_summary() == summary
@@ -0,0 +1,33 @@
+import pickle
+
+import pytest
+
+from upload_cache import UploadCache
+
+
+class _Gone:
+    pass
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return UploadCache(str(tmp_path), budget_bytes=1 << 20)
+
+
+def test_round_trip_and_miss(cache):
+    assert cache.get("missing") is None
+    assert cache.get_or_compute("abc", "frame", lambda: {"rows": 3}) == {"rows": 3}
+    assert cache.get_or_compute("abc", "frame", lambda: pytest.fail("should be cached")) == {"rows": 3}
+
+
+def test_truncated_entry_is_a_miss_and_removed(cache, tmp_path):
+    (tmp_path / "bad.pkl").write_bytes(b"\x80\x05\x95")
+    assert cache.get("bad") is None
+    assert not (tmp_path / "bad.pkl").exists()
+
+
+def test_entry_from_a_removed_class_is_recomputed(cache, tmp_path):
+    (tmp_path / "old-frame.pkl").write_bytes(pickle.dumps(_Gone()))
+    del globals()["_Gone"]  # Unpickling now fails with AttributeError, as after a module change
+    assert cache.get_or_compute("old", "frame", lambda: "fresh") == "fresh"
+    assert cache.get("old-frame") == "fresh"
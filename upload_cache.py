@@ -0,0 +1,100 @@
+import hashlib
+import os
+import pickle
+
+# Shared by every dashboard process on the host unless overridden
+DEFAULT_CACHE_DIR = os.environ.get(
+    "CLEAR_UPLOAD_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "clear_dashboard", "uploads")
+)
+DEFAULT_BUDGET_BYTES = int(os.environ.get("CLEAR_UPLOAD_CACHE_BYTES", 2 * 1024 ** 3))
+
+_HASH_CHUNK = 1 << 20
+
+
+def stream_digest(file):
+    """BLAKE2b digest of a binary file object, read in 1 MiB chunks; the position is restored."""
+    position = file.tell()
+    file.seek(0)
+    digest = hashlib.blake2b(digest_size=32)
+    for chunk in iter(lambda: file.read(_HASH_CHUNK), b""):
+        digest.update(chunk)
+    file.seek(position)
+    return digest.hexdigest()
+
+
+class UploadCache:
+    """Disk-backed cache of parsed uploads keyed by content digest.
+
+    Entries are pickles written atomically, so several processes can share the
+    directory. A hit refreshes the entry's mtime, and eviction removes the least
+    recently used entries until the directory fits the byte budget.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, budget_bytes=DEFAULT_BUDGET_BYTES):
+        self.directory = directory
+        self.budget_bytes = budget_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key):
+        """Return the cached value or None."""
+        path = self._path(key)
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            # Missing, or evicted by another process
+            return None
+        try:
+            with f:
+                value = pickle.load(f)
+        except Exception:
+            # Truncated, or written by a pandas or module version that no longer loads it
+            self._discard(path)
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return value
+
+    @staticmethod
+    def _discard(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def put(self, key, value):
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def get_or_compute(self, digest, kind, compute):
+        """Return the value cached for (digest, kind), computing and storing it on a miss."""
+        key = f"{digest}-{kind}"
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def evict(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pkl"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.budget_bytes:
+                break
+            self._discard(path)
+            total -= size